@@ -0,0 +1,48 @@
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from backend.api.v1.habits import export_response, get_read_export_service
+from backend.core.config import settings
+from backend.services.export_service import ExportFormat, ExportService, ExportTable
+
+
+async def require_admin_key(x_admin_key: Annotated[str | None, Header()] = None) -> None:
+    """Allow the request only with the configured admin API key."""
+    if (
+        not settings.admin_api_key
+        or x_admin_key is None
+        or not secrets.compare_digest(x_admin_key.encode(), settings.admin_api_key.encode())
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API key required")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_key)])
+
+
+@router.get(
+    "/habits/export",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "text/csv": {}, "application/gzip": {}}}},
+)
+async def export_all_habits(
+    export_service: Annotated[ExportService, Depends(get_read_export_service)],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+    include: ExportTable | None = None,
+    gzip: bool = False,
+) -> StreamingResponse:
+    """
+    Download the habits and completions of all users, ordered by user, for analytics pipelines.
+    Memory use does not depend on the number of rows.
+    Requires the X-Admin-Key header.
+
+    Args:
+        export_format: `ndjson` (default) or `csv`.
+        include: Export only `habits` or only `completions`; same defaults as /v1/habits/export.
+        gzip: Compress the file with gzip.
+    """
+    tables = (include,) if include else None
+    stream = export_service.stream_export(export_format, compress=gzip, tables=tables)
+    return export_response(stream, export_format, f"{include or 'habits'}-all", gzip)
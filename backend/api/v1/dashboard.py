@@ -0,0 +1,34 @@
+from datetime import UTC, datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, status
+
+from backend.api.v1.habits import get_current_read_user, get_read_habit_service
+from backend.schemas.dashboard import DashboardResponse
+from backend.schemas.user import UserResponse
+from backend.services.habit_service import HabitService, calculate_habit_stats
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("", response_model=DashboardResponse, status_code=status.HTTP_200_OK)
+async def get_dashboard(
+    habit_service: Annotated[HabitService, Depends(get_read_habit_service)],
+    current_user: Annotated[UserResponse, Depends(get_current_read_user)],
+) -> DashboardResponse:
+    """
+    Get active habits, which of them are done today and the headline statistics.
+    All of it comes from one query over the user's habits.
+    Requires Bearer token in Authorization header.
+    """
+    today = datetime.now(UTC).date()
+    user_habits = await habit_service.get_user_habits(current_user.id)
+    active_habits = [habit for habit in user_habits if habit.is_active]
+    return DashboardResponse(
+        date=today,
+        habits=active_habits,
+        completed_today_ids=[
+            habit.id for habit in active_habits if habit.last_completed and habit.last_completed.date() == today
+        ],
+        stats=calculate_habit_stats(user_habits, today),
+    )
@@ -1,16 +1,18 @@
-from datetime import UTC, datetime, timedelta
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import settings
-from backend.db.session import get_db
-from backend.schemas.habit import HabitCreate, HabitResponse, HabitUpdate
+from backend.db.session import get_db, get_read_db, get_read_snapshot_db
+from backend.schemas.habit import HabitCreate, HabitResponse, HabitStats, HabitUpdate
 from backend.schemas.user import UserResponse
-from backend.services.habit_service import HabitService
+from backend.services.export_service import EXPORT_MEDIA_TYPES, ExportFormat, ExportService, ExportTable
+from backend.services.habit_service import HabitService, calculate_habit_stats
 from backend.services.notification_service import NotificationService
 from backend.services.user_service import UserService
 
@@ -33,6 +35,16 @@ async def get_user_service(db: Annotated[AsyncSession, Depends(get_db)]) -> User
     return UserService(db)
 
 
+async def get_read_habit_service(db: Annotated[AsyncSession, Depends(get_read_db)]) -> HabitService:
+    """Dependency to provide HabitService with read-only database session."""
+    return HabitService(db)
+
+
+async def get_read_user_service(db: Annotated[AsyncSession, Depends(get_read_db)]) -> UserService:
+    """Dependency to provide UserService with read-only database session."""
+    return UserService(db)
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     user_service: Annotated[UserService, Depends(get_user_service)],
@@ -41,10 +53,40 @@ async def get_current_user(
     return await user_service.get_current_user(token)
 
 
+async def get_current_read_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    user_service: Annotated[UserService, Depends(get_read_user_service)],
+) -> UserResponse:
+    """Get the current authenticated user for read-only routes."""
+    return await user_service.get_current_user(token)
+
+
+async def get_read_export_service(db: Annotated[AsyncSession, Depends(get_read_snapshot_db)]) -> ExportService:
+    """Dependency to provide ExportService with a read-only snapshot session (exports stream from a cursor)."""
+    return ExportService(db)
+
+
+def export_response(
+    stream: AsyncIterator[bytes], export_format: ExportFormat, filename: str, compress: bool
+) -> StreamingResponse:
+    """Wrap an export stream into a downloadable response."""
+    if compress:
+        return StreamingResponse(
+            stream,
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}.gz"'},
+        )
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+
 @router.get("", response_model=list[HabitResponse], status_code=status.HTTP_200_OK)
 async def get_all_habits(
-    habit_service: Annotated[HabitService, Depends(get_habit_service)],
-    current_user: Annotated[UserResponse, Depends(get_current_user)],
+    habit_service: Annotated[HabitService, Depends(get_read_habit_service)],
+    current_user: Annotated[UserResponse, Depends(get_current_read_user)],
 ) -> list[HabitResponse]:
     """
     Retrieve a list of all habits.
@@ -59,8 +101,8 @@ async def get_all_habits(
 
 @router.get("/active", response_model=list[HabitResponse], status_code=status.HTTP_200_OK)
 async def get_all_active_habits(
-    habit_service: Annotated[HabitService, Depends(get_habit_service)],
-    current_user: Annotated[UserResponse, Depends(get_current_user)],
+    habit_service: Annotated[HabitService, Depends(get_read_habit_service)],
+    current_user: Annotated[UserResponse, Depends(get_current_read_user)],
 ) -> list[HabitResponse]:
     """
     Get all active habits for the current user.
@@ -70,12 +112,12 @@ async def get_all_active_habits(
     return [habit for habit in result if habit.user_id == current_user.id]
 
 
-@router.get("/stats")
+@router.get("/stats", response_model=HabitStats, status_code=status.HTTP_200_OK)
 async def get_habits_stats(
-    habit_service: Annotated[HabitService, Depends(get_habit_service)],
-    current_user: Annotated[UserResponse, Depends(get_current_user)],
-) -> JSONResponse:
-    """_summary_
+    habit_service: Annotated[HabitService, Depends(get_read_habit_service)],
+    current_user: Annotated[UserResponse, Depends(get_current_read_user)],
+) -> HabitStats:
+    """
     Get comprehensive statistics about user's habits.
 
     Includes:
@@ -89,56 +131,43 @@ async def get_habits_stats(
     Returns:
         JSON object with detailed statistics.
     """
-    user_id = current_user.id
-    today = datetime.now(UTC).date()
-    week_ago = today - timedelta(days=7)
-
-    all_habits = await habit_service.get_all_habits()
-    user_habits = [h for h in all_habits if h.user_id == user_id]
-
-    if not user_habits:
-        return {
-            "total_active_habits": 0,
-            "completed_today": 0,
-            "completed_this_week": 0,
-            "total_completions_all_time": 0,
-            "current_streak_days": 0,
-            "best_habit": None,
-            "best_habit_count": 0,
-        }
-
-    completed_today = sum(1 for h in user_habits if h.last_completed and h.last_completed.date() == today)
-    completed_week = sum(1 for h in user_habits if h.last_completed and h.last_completed.date() >= week_ago)
-    total_completions = sum(h.completion_count for h in user_habits)
-    best_habit = max(user_habits, key=lambda h: h.completion_count, default=None)
-
-    # Стрик — сколько дней подряд было хотя бы одно выполнение
-    streak = 0
-    check_date = today
-    while True:
-        has_completion = any(h.last_completed and h.last_completed.date() == check_date for h in user_habits)
-        if has_completion:
-            streak += 1
-            check_date -= timedelta(days=1)
-        else:
-            break
-
-    return {
-        "total_active_habits": len(user_habits),
-        "completed_today": completed_today,
-        "completed_this_week": completed_week,
-        "total_completions_all_time": total_completions,
-        "current_streak_days": streak,
-        "best_habit": best_habit.title if best_habit else None,
-        "best_habit_count": best_habit.completion_count if best_habit else 0,
-    }
+    user_habits = await habit_service.get_user_habits(current_user.id)
+    return calculate_habit_stats(user_habits, datetime.now(UTC).date())
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}, "text/csv": {}, "application/gzip": {}}}},
+)
+async def export_habits(
+    export_service: Annotated[ExportService, Depends(get_read_export_service)],
+    current_user: Annotated[UserResponse, Depends(get_current_read_user)],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+    include: ExportTable | None = None,
+    gzip: bool = False,
+) -> StreamingResponse:
+    """
+    Download all habits and completions of the current user as NDJSON (one object per line) or CSV.
+    Rows are streamed from the database, so the export is never held in memory.
+    Requires Bearer token in Authorization header.
+
+    Args:
+        export_format: `ndjson` (default) or `csv`.
+        include: Export only `habits` or only `completions`. By default NDJSON holds both,
+            told apart by their `kind` field, and CSV holds habits.
+        gzip: Compress the file with gzip.
+    """
+    tables = (include,) if include else None
+    stream = export_service.stream_export(export_format, user_id=current_user.id, compress=gzip, tables=tables)
+    return export_response(stream, export_format, include or "habits", gzip)
 
 
 @router.get("/{habit_id}", response_model=HabitResponse, status_code=status.HTTP_200_OK)
 async def get_habit_by_id(
     habit_id: int,
-    habit_service: Annotated[HabitService, Depends(get_habit_service)],
-    current_user: Annotated[UserResponse, Depends(get_current_user)],
+    habit_service: Annotated[HabitService, Depends(get_read_habit_service)],
+    current_user: Annotated[UserResponse, Depends(get_current_read_user)],
 ) -> HabitResponse:
     """
     Retrieve a specific habit by ID.
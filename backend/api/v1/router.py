@@ -1,8 +1,30 @@
 from fastapi import APIRouter
 
+from backend.api.v1.admin import router as admin_router
+from backend.api.v1.dashboard import router as dashboard_router
 from backend.api.v1.habits import router as habits_router
 from backend.api.v1.users import router as users_router
+from backend.core.rate_limit import RateLimit, RouteLimits
 
 router = APIRouter(prefix="/v1")
 router.include_router(habits_router)
 router.include_router(users_router)
+router.include_router(dashboard_router)
+router.include_router(admin_router)
+
+# Token buckets per route group, enforced by RateLimitMiddleware before routing.
+# Per-IP limits are higher: one IP can front several users (the bot is exempt via its service key).
+rate_limits = {
+    f"{router.prefix}{habits_router.prefix}": RouteLimits(
+        per_user=RateLimit(rate=10, burst=30), per_ip=RateLimit(rate=50, burst=150)
+    ),
+    f"{router.prefix}{users_router.prefix}": RouteLimits(
+        per_user=RateLimit(rate=1, burst=10), per_ip=RateLimit(rate=10, burst=50)
+    ),
+    f"{router.prefix}{dashboard_router.prefix}": RouteLimits(
+        per_user=RateLimit(rate=5, burst=15), per_ip=RateLimit(rate=25, burst=75)
+    ),
+    f"{router.prefix}{admin_router.prefix}": RouteLimits(
+        per_user=RateLimit(rate=1, burst=5), per_ip=RateLimit(rate=1, burst=5)
+    ),
+}
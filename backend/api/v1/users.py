@@ -2,20 +2,19 @@ from datetime import timedelta
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, status
-from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.api.v1.habits import get_current_read_user
 from backend.db.session import get_db
-from backend.schemas.user import Token, UserCreate, UserResponse
+from backend.schemas.user import Token, UserBase, UserCreate, UserResponse
 from backend.services.user_service import ACCESS_TOKEN_EXPIRE_MINUTES, UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-class TelegramAuthRequest(BaseModel):
-    """Request schema for Telegram authentication."""
+class TelegramAuthRequest(UserBase):
+    """Request schema for Telegram authentication; profile fields, when sent, are stored on the user."""
 
-    telegram_id: int
     auth_token: str
 
 
@@ -30,9 +29,10 @@ async def telegram_auth(
     user_service: Annotated[UserService, Depends(get_user_service)],
 ) -> Token:
     """Authenticate a Telegram user and return a JWT token."""
+    user_create = UserCreate(**auth_data.model_dump(exclude={"auth_token"}))
     if auth_data.auth_token == "debug_local_auth":
         # Создаём или получаем пользователя БЕЗ проверки auth_token
-        user_create = UserCreate(telegram_id=auth_data.telegram_id)
+        # The profile is upserted in the same statement, so login needs no separate /register call
         user = await user_service.get_or_create_user(user_create)
 
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -40,7 +40,11 @@ async def telegram_auth(
             data={"sub": str(user.telegram_id)}, expires_delta=access_token_expires
         )
         return Token(access_token=access_token, token_type="bearer")
-    return await user_service.authenticate_telegram_user(auth_data.telegram_id, auth_data.auth_token)
+    token = await user_service.authenticate_telegram_user(auth_data.telegram_id, auth_data.auth_token)
+    if user_create.username or user_create.first_name or user_create.last_name:
+        # Only after the auth_token has been checked; unchanged profiles make the upsert a no-op
+        await user_service.get_or_create_user(user_create)
+    return token
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -50,3 +54,12 @@ async def register_user(
 ) -> UserResponse:
     """Register or get a Telegram user."""
     return await user_service.get_or_create_user(user_data)
+
+
+@router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
+async def get_me(current_user: Annotated[UserResponse, Depends(get_current_read_user)]) -> UserResponse:
+    """
+    Get the user the Bearer token belongs to.
+    A cheap way for clients to check that a stored token is still valid.
+    """
+    return current_user
@@ -0,0 +1,93 @@
+"""Single-flight coalescing of identical concurrent GET requests."""
+
+import asyncio
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.config import settings
+
+# Headers routes authenticate with; requests share a response only if all of them match
+CREDENTIAL_HEADERS = (b"authorization", b"x-admin-key")
+
+# Values of CREDENTIAL_HEADERS, in that order
+Credentials = tuple[bytes | None, ...]
+# (credentials, path, query string)
+FlightKey = tuple[Credentials, str, bytes]
+
+
+class CoalescingMiddleware:
+    """
+    Concurrent GET requests with the same credentials (Authorization and X-Admin-Key headers),
+    path and query string share one execution: the first runs the app (and its database
+    queries), the rest replay its response.
+
+    Only complete single-body responses are shared; a streaming response releases the waiters,
+    which then run on their own. Any other method drops the client's in-flight reads before and
+    after it runs, so a read sent after a write never receives an answer computed before it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._flights: dict[FlightKey, asyncio.Future[list[Message] | None]] = {}
+
+    @staticmethod
+    def _credentials(scope: Scope) -> Credentials:
+        headers = {name: value for name, value in scope["headers"] if name in CREDENTIAL_HEADERS}
+        return tuple(headers.get(name) for name in CREDENTIAL_HEADERS)
+
+    def _forget_client(self, credentials: Credentials) -> None:
+        for key in [key for key in self._flights if key[0] == credentials]:
+            del self._flights[key]
+
+    def _release(self, key: FlightKey, flight: asyncio.Future, messages: list[Message] | None) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.done():
+            flight.set_result(messages)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.coalesce_get_requests:
+            await self.app(scope, receive, send)
+            return
+
+        credentials = self._credentials(scope)
+        if scope["method"] != "GET":
+            self._forget_client(credentials)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self._forget_client(credentials)
+            return
+
+        key = (credentials, scope["path"], scope["query_string"])
+        flight = self._flights.get(key)
+        if flight is not None:
+            # shield: a follower that disconnects must not cancel the shared result
+            messages = await asyncio.shield(flight)
+            if messages is None:
+                await self.app(scope, receive, send)
+                return
+            for message in messages:
+                await send(message)
+            return
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        recorded: list[Message] | None = []
+
+        async def send_and_record(message: Message) -> None:
+            nonlocal recorded
+            if recorded is not None:
+                if message["type"] == "http.response.body" and message.get("more_body", False):
+                    recorded = None
+                    self._release(key, flight, None)
+                else:
+                    recorded.append(message)
+            await send(message)
+
+        result = None
+        try:
+            await self.app(scope, receive, send_and_record)
+            result = recorded
+        finally:
+            self._release(key, flight, result)
@@ -14,12 +14,25 @@ class Settings(BaseSettings):
     db_port: str = "5432"
     db_name: str = "database"
 
+    db_replica_host: str | None = None
+    db_replica_port: str | None = None
+
     debug: bool = False
 
+    log_json: bool = False
+    log_sampling: dict[str, int] = {}
+
     secret_key: str
+    # Enables the /v1/admin routes; sent by clients in the X-Admin-Key header
+    admin_api_key: str | None = None
 
     habit_duration: int = 21
 
+    rate_limit_enabled: bool = True
+    # Shared with the bot (X-Bot-Key header): its requests skip per-IP rate limits; required while limiting is on
+    bot_service_key: str | None = None
+    coalesce_get_requests: bool = True
+
     telegram_bot_token: str
 
     @property
@@ -28,6 +41,16 @@ class Settings(BaseSettings):
             f"{self.db_connection}://{self.db_username}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def read_database_url(self) -> str:
+        """URL for read-only traffic: the replica when configured, the primary otherwise."""
+        if not self.db_replica_host:
+            return self.database_url
+        return (
+            f"{self.db_connection}://{self.db_username}:{self.db_password}@{self.db_replica_host}:"
+            f"{self.db_replica_port or self.db_port}/{self.db_name}"
+        )
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
 
 
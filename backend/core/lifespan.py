@@ -7,6 +7,7 @@ from fastapi import FastAPI
 
 from backend.core.config import settings
 from backend.core.logger import app_logger as logger
+from backend.core.rate_limit import check_rate_limit_settings
 from backend.db.session import get_db
 from backend.services.habit_service import HabitService
 from backend.services.notification_service import NotificationService
@@ -53,17 +54,30 @@ def _setup_scheduler_jobs(db_session):
         replace_existing=True,
         max_instances=1,
     )
+    scheduler.add_job(
+        notification_service.send_weekly_digest,
+        trigger="cron",
+        day_of_week="sun",
+        hour=18,
+        minute=0,
+        id="send_weekly_digest",
+        replace_existing=True,
+        max_instances=1,
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifecycle manager."""
+    check_rate_limit_settings()
 
     async def initialize_scheduler():
         db = await get_db_with_retry()
         _setup_scheduler_jobs(db)
         scheduler.start()
-        logger.success("Scheduler started → transfer_habits (00:00 UTC), reminders (09:00 UTC)")
+        logger.success(
+            "Scheduler started → transfer_habits (00:00 UTC), reminders (09:00 UTC), weekly digest (Sun 18:00 UTC)"
+        )
 
     task = asyncio.create_task(initialize_scheduler())
     task.add_done_callback(lambda t: t.result() if not t.cancelled() else None)
@@ -78,3 +92,4 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             task.cancel()
             with suppress(asyncio.CancelledError):
                 await task
+        await logger.complete()
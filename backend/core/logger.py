@@ -2,6 +2,9 @@ import sys
 
 from loguru import logger
 
+from backend.core.config import settings
+from common.log_sampling import SamplingFilter
+
 
 def setup_logger():
     logger.remove()
@@ -12,6 +15,9 @@ def setup_logger():
         "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
         "<level>{message}</level>",
         level="INFO",
+        filter=SamplingFilter(settings.log_sampling),
+        serialize=settings.log_json,
+        enqueue=True,
     )
     logger.add(
         sink="logs/app.log",
@@ -19,7 +25,9 @@ def setup_logger():
         retention="5 days",
         level="INFO",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{line} - {message}",
-        serialize=False,  # True, если хочешь JSON
+        filter=SamplingFilter(settings.log_sampling),
+        serialize=settings.log_json,
+        enqueue=True,  # file writes and rotation happen in loguru's worker thread
     )
     return logger
 
@@ -0,0 +1,182 @@
+"""Token-bucket rate limiting applied before routing, so rejected requests never reach the database."""
+
+import math
+import secrets
+import time
+from dataclasses import dataclass
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.core.config import settings
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Sustained ``rate`` requests per second with bursts of up to ``burst`` requests."""
+
+    rate: float
+    burst: int
+
+
+@dataclass(frozen=True)
+class RouteLimits:
+    """Buckets of one route group: one per user, and one per client IP shared by everyone behind it."""
+
+    per_user: RateLimit
+    per_ip: RateLimit
+
+
+# (tokens left, last update, moment the bucket is full again) -- a full bucket carries no state
+Bucket = tuple[float, float, float]
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by arbitrary hashable keys, spread over ``shards`` dicts.
+
+    Full buckets behave exactly like missing ones, so they are dropped by a sweep that visits
+    one shard at a time; each sweep step scans a small dict instead of stalling the event loop
+    on every bucket at once.
+    """
+
+    def __init__(self, shards: int = 64, sweep_interval: float = 60.0):
+        self._shards: list[dict[object, Bucket]] = [{} for _ in range(shards)]
+        # Visiting one shard per step sweeps every shard once per sweep_interval
+        self._sweep_step = sweep_interval / shards
+        self._sweep_cursor = 0
+        self._next_sweep = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def acquire(self, key: object, limit: RateLimit, now: float | None = None) -> float:
+        """Take one token for ``key``; return 0 if allowed, otherwise seconds until a token is available."""
+        now = time.monotonic() if now is None else now
+        if now >= self._next_sweep:
+            self._sweep_shard(now)
+
+        shard = self._shards[hash(key) % len(self._shards)]
+        bucket = shard.get(key)
+        if bucket is None:
+            tokens = float(limit.burst)
+        else:
+            tokens = min(float(limit.burst), bucket[0] + (now - bucket[1]) * limit.rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        shard[key] = (tokens, now, now + (limit.burst - tokens) / limit.rate)
+        return 0.0 if allowed else (1 - tokens) / limit.rate
+
+    def _sweep_shard(self, now: float) -> None:
+        shard = self._shards[self._sweep_cursor]
+        for key in [key for key, bucket in shard.items() if bucket[2] <= now]:
+            del shard[key]
+        self._sweep_cursor = (self._sweep_cursor + 1) % len(self._shards)
+        self._next_sweep = now + self._sweep_step
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+
+rate_limiter = RateLimiter()
+
+
+def check_rate_limit_settings() -> None:
+    """
+    Refuse to run limits without a bot service key: the bot sends every user's requests from
+    one IP, so without the key they would all share one per-IP bucket and get 429s together.
+    """
+    if settings.rate_limit_enabled and not settings.bot_service_key:
+        msg = "BOT_SERVICE_KEY must be set when RATE_LIMIT_ENABLED is on (or turn rate limiting off)"
+        raise RuntimeError(msg)
+
+
+class RateLimitMiddleware:
+    """
+    Limits requests per route group (the longest matching path prefix in ``limits``).
+
+    Every request takes a token from its client IP's bucket, so inventing a new bearer token per
+    request does not help. Requests with a bearer token also take one from the token's bucket: it
+    is hashed as is, without decoding the JWT.
+
+    The bot sends all its users' traffic from one IP, so requests carrying the shared bot service
+    key (``X-Bot-Key``) skip the IP bucket; its anonymous requests (logins, token refreshes) are
+    limited per Telegram user given in ``X-Telegram-Id`` instead.
+    """
+
+    def __init__(self, app: ASGIApp, limits: dict[str, RouteLimits], limiter: RateLimiter = rate_limiter):
+        self.app = app
+        # Longest prefix first, so nested groups win over their parents
+        self.limits = sorted(limits.items(), key=lambda item: len(item[0]), reverse=True)
+        self.limiter = limiter
+
+    def _match(self, path: str) -> tuple[str, RouteLimits] | None:
+        for prefix, limits in self.limits:
+            if path == prefix or path.startswith(prefix + "/"):
+                return prefix, limits
+        return None
+
+    @staticmethod
+    def _is_trusted(bot_key: bytes | None) -> bool:
+        return (
+            bot_key is not None
+            and settings.bot_service_key is not None
+            and secrets.compare_digest(bot_key, settings.bot_service_key.encode())
+        )
+
+    def _bucket_keys(self, scope: Scope) -> tuple[object | None, object | None]:
+        """(user key, IP key) of the request; None where that bucket does not apply."""
+        token = bot_key = telegram_id = None
+        for name, value in scope["headers"]:
+            if name == b"authorization" and value[:7].lower() == b"bearer ":
+                token = value[7:]
+            elif name == b"x-bot-key":
+                bot_key = value
+            elif name == b"x-telegram-id":
+                telegram_id = value
+
+        trusted = self._is_trusted(bot_key)
+        if token is not None:
+            user_key = ("token", hash(token))
+        elif trusted and telegram_id is not None:
+            user_key = ("telegram", telegram_id)
+        else:
+            user_key = None
+
+        if trusted:
+            return user_key, None
+        client = scope.get("client")
+        return user_key, ("ip", client[0] if client else None)
+
+    def _acquire(self, prefix: str, limits: RouteLimits, scope: Scope) -> float:
+        user_key, ip_key = self._bucket_keys(scope)
+        if ip_key is not None and (retry_after := self.limiter.acquire((prefix, *ip_key), limits.per_ip)):
+            return retry_after
+        if user_key is not None:
+            return self.limiter.acquire((prefix, *user_key), limits.per_user)
+        return 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.rate_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        matched = self._match(scope["path"])
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self._acquire(*matched, scope)
+        if retry_after:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -14,3 +14,20 @@ def get_engine() -> AsyncEngine:
         pool_pre_ping=True,
         future=True,
     )
+
+
+def get_read_engine(url: str | None = None) -> AsyncEngine:
+    """
+    Create and return async engine for read-only traffic.
+
+    Connections run in autocommit mode, so no BEGIN/COMMIT is sent around queries,
+    and the server rejects any write on them. Points to the replica if one is configured.
+    """
+    return create_async_engine(
+        url=url or settings.read_database_url,
+        echo=False,
+        pool_pre_ping=True,
+        future=True,
+        isolation_level="AUTOCOMMIT",
+        connect_args={"server_settings": {"default_transaction_read_only": "on"}},
+    )
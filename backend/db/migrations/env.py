@@ -5,7 +5,8 @@ from sqlalchemy import engine_from_config, pool
 
 from backend.core.config import settings
 from backend.db.base import Base
-from backend.models.habit import Habit  # noqa: F401
+from backend.models.bot_state import BotFSMState, BotPendingCompletion, BotUserToken  # noqa: F401
+from backend.models.habit import Habit, HabitCompletion  # noqa: F401
 from backend.models.user import User  # noqa: F401
 
 config = context.config
@@ -0,0 +1,43 @@
+"""Bot shared state
+
+Revision ID: 5c2e9a7d1f43
+Revises: b4f7886fc39c
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a7d1f43'
+down_revision: str | Sequence[str] | None = 'b4f7886fc39c'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('bot_user_tokens',
+    sa.Column('telegram_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('jwt_token', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('telegram_id')
+    )
+    op.create_table('bot_fsm_states',
+    sa.Column('storage_key', sa.String(length=255), nullable=False),
+    sa.Column('state', sa.String(length=255), nullable=True),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('storage_key')
+    )
+    op.create_index(op.f('ix_bot_fsm_states_updated_at'), 'bot_fsm_states', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bot_fsm_states_updated_at'), table_name='bot_fsm_states')
+    op.drop_table('bot_fsm_states')
+    op.drop_table('bot_user_tokens')
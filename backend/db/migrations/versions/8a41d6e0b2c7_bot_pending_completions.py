@@ -0,0 +1,39 @@
+"""Bot pending completions
+
+Revision ID: 8a41d6e0b2c7
+Revises: 5c2e9a7d1f43
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8a41d6e0b2c7'
+down_revision: str | Sequence[str] | None = '5c2e9a7d1f43'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('bot_pending_completions',
+    sa.Column('idempotency_key', sa.String(length=100), nullable=False),
+    sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+    sa.Column('habit_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.String(length=10), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('idempotency_key')
+    )
+    op.create_index(
+        op.f('ix_bot_pending_completions_next_attempt_at'), 'bot_pending_completions', ['next_attempt_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bot_pending_completions_next_attempt_at'), table_name='bot_pending_completions')
+    op.drop_table('bot_pending_completions')
@@ -0,0 +1,27 @@
+"""User notifications_disabled_at
+
+Revision ID: d7b3f1c9e5a2
+Revises: 8a41d6e0b2c7
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b3f1c9e5a2'
+down_revision: str | Sequence[str] | None = '8a41d6e0b2c7'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('notifications_disabled_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'notifications_disabled_at')
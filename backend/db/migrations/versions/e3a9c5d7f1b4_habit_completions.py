@@ -0,0 +1,45 @@
+"""Habit completions history
+
+Revision ID: e3a9c5d7f1b4
+Revises: d7b3f1c9e5a2
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c5d7f1b4'
+down_revision: str | Sequence[str] | None = 'd7b3f1c9e5a2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('habit_completions',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('habit_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('completed_on', sa.Date(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['habit_id'], ['habits.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('habit_id', 'completed_on')
+    )
+    op.create_index('ix_habit_completions_user_id_completed_on', 'habit_completions', ['user_id', 'completed_on'], unique=False)
+    # last_completed survives the nightly transfer only for today's completions; keep those
+    op.execute(
+        "INSERT INTO habit_completions (habit_id, user_id, completed_on, completed_at) "
+        "SELECT id, user_id, (last_completed AT TIME ZONE 'UTC')::date, last_completed "
+        "FROM habits WHERE last_completed IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_habit_completions_user_id_completed_on', table_name='habit_completions')
+    op.drop_table('habit_completions')
@@ -4,7 +4,7 @@ from collections.abc import AsyncIterator
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from backend.db.engine import get_engine
+from backend.db.engine import get_engine, get_read_engine
 
 engine = get_engine()
 AsyncSessionLocal = async_sessionmaker(
@@ -14,6 +14,14 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+read_engine = get_read_engine()
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 
 async def get_db() -> AsyncIterator[AsyncSession]:
     async with AsyncSessionLocal() as session:
@@ -25,3 +33,22 @@ async def get_db() -> AsyncIterator[AsyncSession]:
             raise
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """Read-only session without an explicit transaction; nothing to commit or roll back."""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+async def get_read_snapshot_db() -> AsyncIterator[AsyncSession]:
+    """
+    Read-only session inside a REPEATABLE READ transaction on the read engine.
+
+    Server-side cursors (``AsyncSession.stream``) need a transaction, which the autocommit
+    sessions of get_read_db never open; the snapshot also keeps long reads consistent.
+    The transaction is rolled back when the session closes.
+    """
+    async with ReadSessionLocal() as session:
+        await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        yield session
@@ -1,8 +1,11 @@
 from fastapi import FastAPI
 
+from backend.api.v1.router import rate_limits
 from backend.api.v1.router import router as v1_router
+from backend.core.coalescing import CoalescingMiddleware
 from backend.core.config import settings
 from backend.core.lifespan import lifespan
+from backend.core.rate_limit import RateLimitMiddleware
 
 app = FastAPI(
     title="Habit Tracker API",
@@ -24,6 +27,9 @@ app = FastAPI(
 
 
 app.include_router(router=v1_router)
+# The last added middleware runs first: coalesced reads still count against the rate limit
+app.add_middleware(CoalescingMiddleware)
+app.add_middleware(RateLimitMiddleware, limits=rate_limits)
 
 
 @app.get("/")
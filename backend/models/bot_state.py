@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.db.base import Base
+
+
+class BotUserToken(Base):
+    """
+    JWT the bot stores for a Telegram user.
+    Written and read by the bot directly (bot/storage/postgres.py), shared by all bot replicas.
+    """
+
+    __tablename__ = "bot_user_tokens"
+
+    telegram_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    jwt_token: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class BotFSMState(Base):
+    """
+    Persisted aiogram FSM state of a chat, keyed by the aiogram storage key.
+    Written and read by the bot directly (bot/storage/postgres.py), shared by all bot replicas.
+    """
+
+    __tablename__ = "bot_fsm_states"
+
+    storage_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    state: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    data: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class BotPendingCompletion(Base):
+    """
+    Habit completion the bot could not deliver to the API yet and will retry.
+    Written and read by the bot directly (bot/storage/postgres.py), shared by all bot replicas.
+    """
+
+    __tablename__ = "bot_pending_completions"
+
+    idempotency_key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    habit_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    day: Mapped[str] = mapped_column(String(10), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.db.base import Base
@@ -25,3 +25,25 @@ class Habit(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Habit(id={self.id}, title='{self.title}', user_id={self.user_id})>"
+
+
+class HabitCompletion(Base):
+    """
+    One completion of a habit, at most one per habit per UTC day.
+    Unlike Habit.last_completed, which the nightly transfer resets, it is kept as history.
+    """
+
+    __tablename__ = "habit_completions"
+    __table_args__ = (
+        UniqueConstraint("habit_id", "completed_on"),
+        Index("ix_habit_completions_user_id_completed_on", "user_id", "completed_on"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    habit_id: Mapped[int] = mapped_column(Integer, ForeignKey("habits.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    completed_on: Mapped[date] = mapped_column(Date, nullable=False)
+    completed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<HabitCompletion(habit_id={self.habit_id}, completed_on={self.completed_on})>"
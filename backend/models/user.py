@@ -1,4 +1,6 @@
-from sqlalchemy import BigInteger, Boolean, String
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.db.base import Base
@@ -20,6 +22,8 @@ class User(Base, TimestampMixin):
     last_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     auth_token: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Set when Telegram reports the chat unreachable (bot blocked, account deleted); cleared on next login
+    notifications_disabled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, telegram_id={self.telegram_id}, username={self.username})>"
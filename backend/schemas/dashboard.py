@@ -0,0 +1,14 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+from backend.schemas.habit import HabitResponse, HabitStats
+
+
+class DashboardResponse(BaseModel):
+    """Schema for everything the bot's main screens show, in one response."""
+
+    date: date
+    habits: list[HabitResponse]
+    completed_today_ids: list[int]
+    stats: HabitStats
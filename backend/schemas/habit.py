@@ -37,3 +37,15 @@ class HabitResponse(HabitBase):
     last_completed: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class HabitStats(BaseModel):
+    """Schema for the headline statistics of a user's habits."""
+
+    total_active_habits: int
+    completed_today: int
+    completed_this_week: int
+    total_completions_all_time: int
+    current_streak_days: int
+    best_habit: str | None
+    best_habit_count: int
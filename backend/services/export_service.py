@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Iterable
+from enum import StrEnum
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.habit import Habit, HabitCompletion
+from backend.models.user import User
+
+EXPORT_COLUMNS = (
+    "id",
+    "user_id",
+    "telegram_id",
+    "title",
+    "description",
+    "is_active",
+    "completion_count",
+    "last_completed",
+    "created_at",
+    "updated_at",
+)
+COMPLETION_EXPORT_COLUMNS = ("id", "habit_id", "user_id", "telegram_id", "completed_on", "completed_at")
+# Rows fetched from the server-side cursor (and written to the response) at a time
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportTable(StrEnum):
+    HABITS = "habits"
+    COMPLETIONS = "completions"
+
+
+EXPORT_MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv"}
+TABLE_COLUMNS = {ExportTable.HABITS: EXPORT_COLUMNS, ExportTable.COMPLETIONS: COMPLETION_EXPORT_COLUMNS}
+# NDJSON records carry a "kind", so one file can hold both tables
+TABLE_KINDS = {ExportTable.HABITS: "habit", ExportTable.COMPLETIONS: "completion"}
+# A CSV file holds a single table; NDJSON exports everything by default
+DEFAULT_EXPORT_TABLES = {
+    ExportFormat.NDJSON: (ExportTable.HABITS, ExportTable.COMPLETIONS),
+    ExportFormat.CSV: (ExportTable.HABITS,),
+}
+
+
+def _export_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+class ExportService:
+    """Streams habits and their completion history out of the database without loading them into memory."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _encode_batch(rows: Iterable, export_format: ExportFormat, table: ExportTable) -> str:
+        columns = TABLE_COLUMNS[table]
+        if export_format == ExportFormat.NDJSON:
+            kind = TABLE_KINDS[table]
+            return "".join(
+                json.dumps(
+                    {"kind": kind, **{column: _export_value(row[column]) for column in columns}}, ensure_ascii=False
+                )
+                + "\n"
+                for row in rows
+            )
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([_export_value(row[column]) for column in columns] for row in rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _select(table: ExportTable, user_id: int | None):
+        if table == ExportTable.HABITS:
+            stmt = (
+                select(Habit.__table__, User.telegram_id)
+                .join(User, User.id == Habit.user_id)
+                .order_by(Habit.user_id, Habit.id)
+            )
+            model = Habit
+        else:
+            stmt = (
+                select(HabitCompletion.__table__, User.telegram_id)
+                .join(User, User.id == HabitCompletion.user_id)
+                .order_by(HabitCompletion.user_id, HabitCompletion.completed_on, HabitCompletion.id)
+            )
+            model = HabitCompletion
+        if user_id is not None:
+            stmt = stmt.where(model.user_id == user_id)
+        return stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    async def stream_export(
+        self,
+        export_format: ExportFormat,
+        user_id: int | None = None,
+        compress: bool = False,
+        tables: tuple[ExportTable, ...] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the export in chunks of EXPORT_BATCH_SIZE rows, read through a server-side cursor.
+        Exports every user's rows when user_id is None. ``tables`` defaults to DEFAULT_EXPORT_TABLES;
+        they are read one after another, so the session should hold a snapshot to keep them consistent.
+        CSV takes a single table and starts with a header row; with compress=True the chunks form
+        a single gzip stream.
+        """
+        tables = tables or DEFAULT_EXPORT_TABLES[export_format]
+        if export_format == ExportFormat.CSV and len(tables) != 1:
+            msg = "A CSV export holds exactly one table"
+            raise ValueError(msg)
+
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+
+        def encode(text: str) -> bytes:
+            data = text.encode()
+            return compressor.compress(data) if compressor else data
+
+        if export_format == ExportFormat.CSV:
+            yield encode(",".join(TABLE_COLUMNS[tables[0]]) + "\r\n")
+
+        for table in tables:
+            result = await self.db.stream(self._select(table, user_id))
+            async for rows in result.mappings().partitions():
+                yield encode(self._encode_batch(rows, export_format, table))
+
+        if compressor:
+            yield compressor.flush()
@@ -1,11 +1,33 @@
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, time, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import settings
-from backend.models.habit import Habit
-from backend.schemas.habit import HabitCreate, HabitResponse, HabitUpdate
+from backend.models.habit import Habit, HabitCompletion
+from backend.schemas.habit import HabitCreate, HabitResponse, HabitStats, HabitUpdate
+
+
+def calculate_habit_stats(user_habits: list[HabitResponse], today: date) -> HabitStats:
+    """Headline statistics over one user's habits."""
+    week_ago = today - timedelta(days=7)
+    completed_days = {h.last_completed.date() for h in user_habits if h.last_completed}
+
+    # Стрик — сколько дней подряд было хотя бы одно выполнение
+    streak = 0
+    while today - timedelta(days=streak) in completed_days:
+        streak += 1
+
+    best_habit = max(user_habits, key=lambda h: h.completion_count, default=None)
+    return HabitStats(
+        total_active_habits=len(user_habits),
+        completed_today=sum(1 for h in user_habits if h.last_completed and h.last_completed.date() == today),
+        completed_this_week=sum(1 for h in user_habits if h.last_completed and h.last_completed.date() >= week_ago),
+        total_completions_all_time=sum(h.completion_count for h in user_habits),
+        current_streak_days=streak,
+        best_habit=best_habit.title if best_habit else None,
+        best_habit_count=best_habit.completion_count if best_habit else 0,
+    )
 
 
 class HabitService:
@@ -26,6 +48,12 @@ class HabitService:
         habits = result.scalars().all()
         return [HabitResponse.model_validate(habit) for habit in habits]
 
+    async def get_user_habits(self, user_id: int) -> list[HabitResponse]:
+        """Get all habits of one user."""
+        result = await self.db.execute(select(Habit).where(Habit.user_id == user_id).order_by(Habit.id))
+        habits = result.scalars().all()
+        return [HabitResponse.model_validate(habit) for habit in habits]
+
     async def get_habit_by_id(self, habit_id: int) -> HabitResponse | None:
         """Get habit by ID."""
         result = await self.db.execute(select(Habit).where(Habit.id == habit_id))
@@ -76,22 +104,33 @@ class HabitService:
         return True
 
     async def complete_habit(self, habit_id: int) -> HabitResponse | None:
-        """Mark a habit as completed, increment completion_count and update last_completed."""
-        result = await self.db.execute(select(Habit).where(Habit.id == habit_id))
+        """
+        Mark a habit as completed, increment completion_count and update last_completed.
+
+        The once-a-day check and the increment are a single conditional UPDATE, so concurrent
+        requests for the same habit (double taps, retried replays) cannot both count the day.
+        """
+        now = datetime.now(UTC)
+        start_of_day = datetime.combine(now.date(), time.min, tzinfo=UTC)
+        result = await self.db.execute(
+            update(Habit)
+            .where(Habit.id == habit_id, or_(Habit.last_completed.is_(None), Habit.last_completed < start_of_day))
+            .values(completion_count=Habit.completion_count + 1, last_completed=now)
+            .returning(Habit),
+            execution_options={"populate_existing": True},
+        )
         habit = result.scalar_one_or_none()
 
         if not habit:
-            return None
-
-        now = datetime.now(UTC)
-        if habit.last_completed and habit.last_completed.date() == now.date():
+            if await self.db.scalar(select(Habit.id).where(Habit.id == habit_id)) is None:
+                return None
             msg = "Habit already completed today"
             raise ValueError(msg)
 
-        habit.completion_count += 1
-        habit.last_completed = datetime.now(UTC)
+        self.db.add(
+            HabitCompletion(habit_id=habit.id, user_id=habit.user_id, completed_on=now.date(), completed_at=now)
+        )
         await self.db.flush()
-        await self.db.refresh(habit, attribute_names=["updated_at"])
         return HabitResponse.model_validate(habit)
 
     async def transfer_habits(self) -> None:
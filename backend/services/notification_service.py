@@ -1,13 +1,22 @@
-from datetime import UTC, datetime
+import html
+from datetime import UTC, date, datetime, timedelta
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import Integer, Select, cast, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.logger import app_logger as logger
-from backend.models.habit import Habit
+from backend.models.habit import Habit, HabitCompletion
 from backend.models.user import User
 
+# Telegram allows at most 100 buttons per inline keyboard
+REMINDER_MAX_BUTTONS = 100
+BUTTON_TITLE_MAX_LENGTH = 40
+DISABLE_NOTIFICATIONS_CHUNK_SIZE = 1000
+# 400 errors that mean the chat is gone for good; every 403 (blocked, deactivated, ...) does too
+UNREACHABLE_CHAT_ERRORS = ("chat not found", "user not found")
+WEEKLY_DIGEST_CHUNK_SIZE = 5000
+
 
 class NotificationService:
     """Service for sending habit reminders via Telegram."""
@@ -16,8 +25,20 @@ class NotificationService:
         self.db = db
         self.bot_token = bot_token
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        # telegram_ids whose chats Telegram reported as permanently unreachable during the current job
+        self.unreachable_chat_ids: list[int] = []
+
+    @staticmethod
+    def _build_complete_keyboard(habits: list[tuple[int, str]]) -> dict:
+        """Inline keyboard with a `complete:<id>` button per habit, handled by the bot's complete callback."""
+        rows = []
+        for habit_id, title in habits[:REMINDER_MAX_BUTTONS]:
+            if len(title) > BUTTON_TITLE_MAX_LENGTH:
+                title = title[: BUTTON_TITLE_MAX_LENGTH - 1] + "…"
+            rows.append([{"text": f"Done: {title}", "callback_data": f"complete:{habit_id}"}])
+        return {"inline_keyboard": rows}
 
-    async def _send_message(self, chat_id: int, text: str) -> bool:
+    async def _send_message(self, chat_id: int, text: str, reply_markup: dict | None = None) -> bool:
         """Send a single message via Telegram Bot API."""
         url = f"{self.base_url}/sendMessage"
         payload = {
@@ -26,19 +47,48 @@ class NotificationService:
             "parse_mode": "HTML",
             "disable_web_page_preview": True,
         }
+        if reply_markup is not None:
+            payload["reply_markup"] = reply_markup
 
         try:
             async with httpx.AsyncClient(timeout=10.0) as client:
                 response = await client.post(url, json=payload)
                 if response.status_code == 200:
-                    logger.info(f"Reminder sent → telegram_id={chat_id}")
+                    logger.bind(sampled=True).info(f"Reminder sent → telegram_id={chat_id}")
                     return True
+                if self._is_unreachable(response):
+                    logger.bind(sampled=True).info(f"Chat unreachable ({response.text}) | user {chat_id}")
+                    self.unreachable_chat_ids.append(chat_id)
+                    return False
                 logger.error(f"Telegram error {response.status_code}: {response.text} | user {chat_id}")
                 return False
         except Exception as exc:
             logger.exception(f"Failed to send message to {chat_id}: {exc}")
             return False
 
+    @staticmethod
+    def _is_unreachable(response: httpx.Response) -> bool:
+        """Whether Telegram says the chat cannot receive messages anymore (not a transient failure)."""
+        if response.status_code == 403:
+            return True
+        description = response.text.lower()
+        return response.status_code == 400 and any(error in description for error in UNREACHABLE_CHAT_ERRORS)
+
+    async def disable_unreachable_users(self) -> int:
+        """Stamp notifications_disabled_at on users collected in unreachable_chat_ids, in chunked UPDATEs."""
+        chat_ids, self.unreachable_chat_ids = self.unreachable_chat_ids, []
+        for start in range(0, len(chat_ids), DISABLE_NOTIFICATIONS_CHUNK_SIZE):
+            chunk = chat_ids[start : start + DISABLE_NOTIFICATIONS_CHUNK_SIZE]
+            await self.db.execute(
+                update(User)
+                .where(User.telegram_id.in_(chunk), User.notifications_disabled_at.is_(None))
+                .values(notifications_disabled_at=func.now())
+            )
+        if chat_ids:
+            await self.db.commit()
+            logger.info(f"Disabled notifications for {len(chat_ids)} unreachable users")
+        return len(chat_ids)
+
     async def send_daily_reminders(self) -> None:
         """Send morning reminders about incomplete habits."""
         logger.info("Starting daily reminders job")
@@ -47,15 +97,15 @@ class NotificationService:
         stmt = (
             select(User, Habit)
             .join(Habit, User.id == Habit.user_id)
-            .where(User.is_active.is_(True), Habit.is_active.is_(True))
+            .where(User.is_active.is_(True), User.notifications_disabled_at.is_(None), Habit.is_active.is_(True))
         )
 
         result = await self.db.execute(stmt)
-        reminders: dict[int, list[str]] = {}
+        reminders: dict[int, list[tuple[int, str]]] = {}
 
         for user, habit in result:
             if not habit.last_completed or habit.last_completed.date() != today:
-                reminders.setdefault(user.telegram_id, []).append(f"-- {habit.title}")
+                reminders.setdefault(user.telegram_id, []).append((habit.id, habit.title))
 
         if not reminders:
             logger.info("No reminders to send today")
@@ -67,10 +117,155 @@ class NotificationService:
             text = (
                 f"Good morning!\n\n"
                 f"You have <b>{count}</b> habit{'s' if count > 1 else ''} to complete today:\n\n"
-                + "\n".join(habits)
+                + "\n".join(f"-- {html.escape(title)}" for _, title in habits)
                 + "\n\nHave a productive day!"
             )
-            if await self._send_message(telegram_id, text):
+            if await self._send_message(telegram_id, text, reply_markup=self._build_complete_keyboard(habits)):
                 sent_count += 1
 
+        await self.disable_unreachable_users()
+
         logger.success(f"Daily reminders completed: {sent_count}/{len(reminders)} users notified")
+
+    @staticmethod
+    def _build_weekly_digest_query(after_user_id: int, limit: int, today: date) -> Select:
+        """
+        One row per notifiable user with id > after_user_id (at most ``limit``, ordered by id):
+        active habits, total completions, completions over the last 7 days, the habit completed
+        most often in them and the current streak. Everything is aggregated in a single
+        statement per chunk, from the habit_completions history.
+        """
+        users = (
+            select(User.id, User.telegram_id)
+            .where(User.is_active.is_(True), User.notifications_disabled_at.is_(None), User.id > after_user_id)
+            .order_by(User.id)
+            .limit(limit)
+            .cte("digest_users")
+        )
+        habit_totals = (
+            select(
+                Habit.user_id,
+                func.count().label("active_habits"),
+                func.sum(Habit.completion_count).label("total_completions"),
+            )
+            .join(users, users.c.id == Habit.user_id)
+            .where(Habit.is_active.is_(True))
+            .group_by(Habit.user_id)
+            .subquery("digest_habit_totals")
+        )
+
+        weekly = (
+            select(
+                HabitCompletion.user_id,
+                HabitCompletion.habit_id,
+                func.count().label("completions"),
+                func.row_number()
+                .over(
+                    partition_by=HabitCompletion.user_id,
+                    order_by=(func.count().desc(), HabitCompletion.habit_id),
+                )
+                .label("rank"),
+            )
+            .join(users, users.c.id == HabitCompletion.user_id)
+            .where(HabitCompletion.completed_on >= today - timedelta(days=6))
+            .group_by(HabitCompletion.user_id, HabitCompletion.habit_id)
+            .subquery("digest_weekly")
+        )
+        best = weekly.c.rank == 1
+        weekly_totals = (
+            select(
+                weekly.c.user_id,
+                func.sum(weekly.c.completions).label("week_completions"),
+                func.max(weekly.c.habit_id).filter(best).label("best_habit_id"),
+                func.max(weekly.c.completions).filter(best).label("best_habit_count"),
+            )
+            .group_by(weekly.c.user_id)
+            .subquery("digest_weekly_totals")
+        )
+
+        # Streak: distinct completion days; consecutive days share day + dense_rank (gaps and islands).
+        # Like calculate_habit_stats, only a run that includes today counts.
+        days = (
+            select(HabitCompletion.user_id, HabitCompletion.completed_on.label("day"))
+            .join(users, users.c.id == HabitCompletion.user_id)
+            .distinct()
+            .cte("digest_days")
+        )
+        islands = select(
+            days.c.user_id,
+            days.c.day,
+            (
+                days.c.day
+                + cast(func.dense_rank().over(partition_by=days.c.user_id, order_by=days.c.day.desc()), Integer)
+            ).label("island"),
+        ).subquery("digest_islands")
+        streaks = (
+            select(islands.c.user_id, func.count().label("streak"))
+            .group_by(islands.c.user_id, islands.c.island)
+            .having(func.max(islands.c.day) == today)
+            .subquery("digest_streaks")
+        )
+
+        return (
+            select(
+                users.c.id.label("user_id"),
+                users.c.telegram_id,
+                func.coalesce(habit_totals.c.active_habits, 0).label("active_habits"),
+                func.coalesce(habit_totals.c.total_completions, 0).label("total_completions"),
+                func.coalesce(weekly_totals.c.week_completions, 0).label("week_completions"),
+                Habit.title.label("best_habit"),
+                func.coalesce(weekly_totals.c.best_habit_count, 0).label("best_habit_count"),
+                func.coalesce(streaks.c.streak, 0).label("current_streak"),
+            )
+            .select_from(users)
+            .outerjoin(habit_totals, habit_totals.c.user_id == users.c.id)
+            .outerjoin(weekly_totals, weekly_totals.c.user_id == users.c.id)
+            .outerjoin(Habit, Habit.id == weekly_totals.c.best_habit_id)
+            .outerjoin(streaks, streaks.c.user_id == users.c.id)
+            .order_by(users.c.id)
+        )
+
+    @staticmethod
+    def _format_weekly_digest(row) -> str:
+        streak = row["current_streak"]
+        text = (
+            f"Your week in habits\n\n"
+            f"Completions this week: <b>{row['week_completions']}</b>\n"
+            f"Active habits: <b>{row['active_habits']}</b>\n"
+            f"Total completions: <b>{row['total_completions']}</b>\n"
+            f"Current streak: <b>{streak}</b> day{'s' if streak != 1 else ''}"
+        )
+        if row["best_habit"]:
+            text += (
+                f"\nBest habit this week: <b>{html.escape(row['best_habit'])}</b> "
+                f"({row['best_habit_count']} completions)"
+            )
+        return text
+
+    async def send_weekly_digest(self) -> None:
+        """Send every user with active habits a summary of their week, reading users in keyset chunks."""
+        logger.info("Starting weekly digest job")
+        today = datetime.now(UTC).date()
+
+        after_user_id = 0
+        sent_count = total = 0
+        while True:
+            stmt = self._build_weekly_digest_query(after_user_id, WEEKLY_DIGEST_CHUNK_SIZE, today)
+            rows = (await self.db.execute(stmt)).mappings().all()
+            if not rows:
+                break
+            after_user_id = rows[-1]["user_id"]
+
+            for row in rows:
+                if not row["active_habits"] and not row["week_completions"]:
+                    continue
+                total += 1
+                if await self._send_message(row["telegram_id"], self._format_weekly_digest(row)):
+                    sent_count += 1
+
+            if len(rows) < WEEKLY_DIGEST_CHUNK_SIZE:
+                break
+
+        await self.disable_unreachable_users()
+
+        logger.success(f"Weekly digest completed: {sent_count}/{total} users notified")
@@ -3,7 +3,8 @@ from datetime import UTC, datetime, timedelta
 
 import jwt
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import exists, func, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.config import settings
@@ -12,6 +13,7 @@ from backend.schemas.user import Token, UserCreate, UserResponse
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+BULK_UPSERT_CHUNK_SIZE = 1000
 
 
 class UserService:
@@ -20,45 +22,78 @@ class UserService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_or_create_user(self, user_data: UserCreate) -> UserResponse:
-        """Get or create a user by telegram_id."""
-        result = await self.db.execute(select(User).where(User.telegram_id == user_data.telegram_id))
-        user = result.scalar_one_or_none()
+    @staticmethod
+    def _build_upsert(users_data: list[UserCreate]):
+        """
+        Build INSERT ... ON CONFLICT (telegram_id) DO UPDATE for the given profiles.
+
+        Only non-null incoming fields overwrite stored ones, and the row is touched only
+        when one of them actually differs (or notifications have to be re-enabled),
+        so repeated logins with the same profile are no-ops.
+        """
+        stmt = insert(User).values(
+            [
+                {
+                    "telegram_id": user_data.telegram_id,
+                    "username": user_data.username,
+                    "first_name": user_data.first_name,
+                    "last_name": user_data.last_name,
+                    "is_active": True,
+                    "auth_token": str(uuid.uuid4()),
+                }
+                for user_data in users_data
+            ]
+        )
+        profile_fields = ("username", "first_name", "last_name")
+        new_values = {field: func.coalesce(stmt.excluded[field], User.__table__.c[field]) for field in profile_fields}
+        return stmt.on_conflict_do_update(
+            index_elements=[User.telegram_id],
+            # A user who logs in again has unblocked the bot, so reminders are turned back on
+            set_={**new_values, "notifications_disabled_at": None, "updated_at": func.now()},
+            where=or_(
+                *(User.__table__.c[field].is_distinct_from(new_values[field]) for field in profile_fields),
+                User.notifications_disabled_at.is_not(None),
+            ),
+        ).returning(*User.__table__.c)
 
-        print(user_data)
-        print(user_data.first_name)
-
-        if user:
-            updated = False
-            if user_data.username is not None and user.username != user_data.username:
-                print("GET USERNAME")
-                user.username = user_data.username
-                updated = True
-            if user_data.first_name is not None and user.first_name != user_data.first_name:
-                print("GET FIRST_NAME")
-                user.first_name = user_data.first_name
-                updated = True
-            if user_data.last_name is not None and user.last_name != user_data.last_name:
-                print("GET LAST_NAME")
-                user.last_name = user_data.last_name
-                updated = True
-
-            if updated:
-                await self.db.flush()
-                await self.db.refresh(user)
-            return UserResponse.model_validate(user)
-
-        user = User(
-            telegram_id=user_data.telegram_id,
-            username=user_data.username,
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-            auth_token=str(uuid.uuid4()),
+    async def get_or_create_user(self, user_data: UserCreate) -> UserResponse:
+        """
+        Get or create a user by telegram_id in a single statement.
+
+        The upsert returns the row when it was inserted or changed; otherwise the existing
+        row is selected within the same statement.
+        """
+        upserted = self._build_upsert([user_data]).cte("upserted")
+        stmt = union_all(
+            select(upserted),
+            select(*User.__table__.c).where(
+                User.telegram_id == user_data.telegram_id,
+                ~exists(select(upserted.c.id)),
+            ),
         )
-        self.db.add(user)
-        await self.db.flush()
-        await self.db.refresh(user)
-        return UserResponse.model_validate(user)
+        result = await self.db.execute(stmt)
+        row = result.mappings().first()
+        if row is None:
+            # The row was inserted by a concurrent transaction after our snapshot was taken.
+            result = await self.db.execute(select(User).where(User.telegram_id == user_data.telegram_id))
+            return UserResponse.model_validate(result.scalar_one())
+        return UserResponse.model_validate(row)
+
+    async def bulk_upsert_users(self, users_data: list[UserCreate]) -> list[UserResponse]:
+        """
+        Create or update many users at once, one statement per chunk.
+
+        Returns only the users that were created or whose profile changed.
+        """
+        # ON CONFLICT cannot touch the same row twice in one statement, so the last profile wins
+        unique_users = list({user_data.telegram_id: user_data for user_data in users_data}.values())
+
+        upserted: list[UserResponse] = []
+        for offset in range(0, len(unique_users), BULK_UPSERT_CHUNK_SIZE):
+            chunk = unique_users[offset : offset + BULK_UPSERT_CHUNK_SIZE]
+            result = await self.db.execute(self._build_upsert(chunk))
+            upserted.extend(UserResponse.model_validate(row) for row in result.mappings())
+        return upserted
 
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
         """Create a JWT access token."""
@@ -0,0 +1,75 @@
+"""Short-lived per-user cache of active habits."""
+
+import time
+from collections import OrderedDict
+
+from bot.config import get_settings
+
+settings = get_settings()
+
+
+class HabitCache:
+    """
+    Bounded LRU of telegram_id -> active habits, each entry valid for ``ttl`` seconds.
+    APIClient keeps it in sync with the results of its own mutations.
+    """
+
+    def __init__(self, max_users: int = 10_000, ttl: float = 30.0):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, list[dict]]] = OrderedDict()
+
+    def get(self, telegram_id: int) -> list[dict] | None:
+        entry = self._entries.get(telegram_id)
+        if entry is None:
+            return None
+        stored_at, habits = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[telegram_id]
+            return None
+        self._entries.move_to_end(telegram_id)
+        return list(habits)
+
+    def get_habit(self, telegram_id: int, habit_id: int) -> dict | None:
+        habits = self.get(telegram_id) or []
+        return next((habit for habit in habits if habit["id"] == habit_id), None)
+
+    def set(self, telegram_id: int, habits: list[dict]) -> None:
+        self._entries[telegram_id] = (time.monotonic(), list(habits))
+        self._entries.move_to_end(telegram_id)
+        if len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def _replace(self, telegram_id: int, habits: list[dict]) -> None:
+        # Keeps the original expiry: a mutation does not make the rest of the list fresher
+        stored_at, _ = self._entries[telegram_id]
+        self._entries[telegram_id] = (stored_at, habits)
+
+    def add_habit(self, telegram_id: int, habit: dict) -> None:
+        habits = self.get(telegram_id)
+        if habits is not None:
+            self._replace(telegram_id, [*habits, habit])
+
+    def update_habit(self, telegram_id: int, habit: dict) -> None:
+        """Replace the cached copy of ``habit``; drop it if it is no longer active."""
+        habits = self.get(telegram_id)
+        if habits is None:
+            return
+        if not habit.get("is_active", True):
+            self.remove_habit(telegram_id, habit["id"])
+            return
+        if all(item["id"] != habit["id"] for item in habits):
+            self.invalidate(telegram_id)
+            return
+        self._replace(telegram_id, [habit if item["id"] == habit["id"] else item for item in habits])
+
+    def remove_habit(self, telegram_id: int, habit_id: int) -> None:
+        habits = self.get(telegram_id)
+        if habits is not None:
+            self._replace(telegram_id, [item for item in habits if item["id"] != habit_id])
+
+    def invalidate(self, telegram_id: int) -> None:
+        self._entries.pop(telegram_id, None)
+
+
+habit_cache = HabitCache(max_users=settings.habit_cache_size, ttl=settings.habit_cache_ttl_seconds)
@@ -0,0 +1,63 @@
+"""Circuit breaker that stops calling the backend while it is failing."""
+
+import time
+
+from bot.config import get_settings
+from bot.exceptions import ServiceUnavailableError
+from bot.logger import log
+
+settings = get_settings()
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures (transport errors and 5xx)
+    and rejects calls for ``reset_timeout`` seconds. Then a single trial call is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        # When the current trial call started; a trial that never reports back expires after reset_timeout
+        self._trial_started_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being rejected without reaching the backend."""
+        if self.opened_at is None:
+            return False
+        now = time.monotonic()
+        if self._trial_started_at is not None and now - self._trial_started_at < self.reset_timeout:
+            return True
+        return now - self.opened_at < self.reset_timeout
+
+    def before_call(self) -> None:
+        if self.opened_at is None:
+            return
+        if self.is_open:
+            raise ServiceUnavailableError()
+        self._trial_started_at = time.monotonic()
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            log.info("Backend is reachable again, closing the circuit")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_started_at = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                log.warning(f"Backend failed {self.failures} times in a row, opening the circuit")
+            self.opened_at = time.monotonic()
+
+
+api_circuit = CircuitBreaker(
+    failure_threshold=settings.circuit_failure_threshold,
+    reset_timeout=settings.circuit_reset_timeout,
+)
@@ -1,92 +1,232 @@
+import asyncio
+from http import HTTPStatus
 from typing import Any
 
 import httpx
-from fastapi import status
 
+from bot.api.cache import habit_cache
+from bot.api.circuit_breaker import api_circuit
 from bot.config import get_settings
 from bot.exceptions import (
+    APIError,
     AuthenticationError,
     AuthorizationError,
     HabitAlreadyCompletedError,
     NotFoundError,
+    RateLimitedError,
     ServerError,
     ValidationError,
 )
+from bot.storage import get_user_token, save_user_token
 
 settings = get_settings()
 
+_http_client: httpx.AsyncClient | None = None
+# telegram_id -> in-flight re-authentication
+_token_refreshes: dict[int, asyncio.Task[str]] = {}
 
-class APIClient:
-    """Fully asynchronous HTTP client for FastAPI backend."""
 
-    def __init__(self, token: str | None = None):
-        self.base_url = settings.api_base_url
-        self.token = token
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            headers={"Authorization": f"Bearer {token}"} if token else {},
+def init_http_client() -> httpx.AsyncClient:
+    """Create the process-wide pooled HTTP client for backend calls."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=settings.api_base_url,
             timeout=10.0,
+            limits=httpx.Limits(
+                max_connections=settings.api_max_connections,
+                max_keepalive_connections=settings.api_max_keepalive_connections,
+            ),
+            http2=settings.api_http2,
+            headers={"X-Bot-Key": settings.bot_service_key} if settings.bot_service_key else None,
         )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the pooled HTTP client and its connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    if _http_client is None:
+        msg = "HTTP client is not initialized, call init_http_client() first"
+        raise RuntimeError(msg)
+    return _http_client
+
+
+def _retry_after(response: httpx.Response, default: float = 1.0) -> float:
+    """Seconds from a Retry-After header; the backend sends whole seconds, never an HTTP date."""
+    try:
+        return max(float(response.headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return default
+
+
+class APIClient:
+    """
+    Per-user view over the shared HTTP client.
+    Cheap to create: it only holds the bearer header, connections come from the shared pool.
+    """
+
+    def __init__(self, token: str | None = None, telegram_id: int | None = None):
+        self.token = token
+        self.telegram_id = telegram_id
+        self.client = get_http_client()
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    def _set_token(self, token: str) -> None:
+        self.token = token
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    async def _reauthenticate(self) -> str:
+        token = await self.auth_telegram(self.telegram_id, settings.telegram_auth_key)
+        await save_user_token(self.telegram_id, token)
+        return token
+
+    async def refresh_token(self) -> None:
+        """
+        Obtain a new JWT after the current one was rejected and store it.
+        Concurrent refreshes for the same user share one in-flight auth call. Any failure,
+        including an open circuit, is raised as AuthorizationError.
+        """
+        stored_token = await get_user_token(self.telegram_id)
+        if stored_token and stored_token != self.token:
+            # Another update already refreshed it
+            self._set_token(stored_token)
+            return
+
+        task = _token_refreshes.get(self.telegram_id)
+        if task is None:
+            task = asyncio.create_task(self._reauthenticate())
+            _token_refreshes[self.telegram_id] = task
+            task.add_done_callback(lambda _: _token_refreshes.pop(self.telegram_id, None))
+
+        try:
+            token = await asyncio.shield(task)
+        except (httpx.HTTPError, APIError) as ex:
+            raise AuthorizationError() from ex
+        self._set_token(token)
 
     async def _handle_response(self, response: httpx.Response) -> Any:
         """Centralized HTTP status code handling with custom exception mapping."""
         status_code = response.status_code
 
-        if status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED):
+        if status_code in (HTTPStatus.OK, HTTPStatus.CREATED):
             return response.json() if response.content else None
-        if status_code == status.HTTP_204_NO_CONTENT:
+        if status_code == HTTPStatus.NO_CONTENT:
             return None
 
-        if status_code == status.HTTP_401_UNAUTHORIZED:
+        if status_code == HTTPStatus.UNAUTHORIZED:
             raise AuthorizationError()
-        if status_code == status.HTTP_403_FORBIDDEN:
+        if status_code == HTTPStatus.FORBIDDEN:
             raise AuthenticationError("Forbidden")
-        if status_code == status.HTTP_404_NOT_FOUND:
+        if status_code == HTTPStatus.NOT_FOUND:
             raise NotFoundError()
-        if status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
+        if status_code == HTTPStatus.UNPROCESSABLE_ENTITY:
             detail = response.json().get("detail", "")
             if isinstance(detail, str) and "already completed today" in detail.lower():
                 raise HabitAlreadyCompletedError()
             raise ValidationError(detail)
+        if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            raise RateLimitedError(_retry_after(response))
         if status_code >= 500:
             raise ServerError(response.text)
 
         response.raise_for_status()
         return None
 
+    async def _send(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send one request through the circuit breaker."""
+        api_circuit.before_call()
+        try:
+            response = await self.client.request(method, endpoint, **kwargs)
+        except httpx.TransportError:
+            api_circuit.record_failure()
+            raise
+        if response.status_code >= 500:
+            api_circuit.record_failure()
+        else:
+            api_circuit.record_success()
+        return response
+
     async def request(self, method: str, endpoint: str, **kwargs) -> Any:
         """Perform HTTP request and handle response."""
-        response = await self.client.request(method, endpoint, **kwargs)
+        extra_headers = kwargs.pop("headers", {})
+        response = await self._send(method, endpoint, headers={**self.headers, **extra_headers}, **kwargs)
+        if response.status_code == HTTPStatus.UNAUTHORIZED and self.telegram_id is not None:
+            await self.refresh_token()
+            response = await self._send(method, endpoint, headers={**self.headers, **extra_headers}, **kwargs)
         return await self._handle_response(response)
 
-    async def auth_telegram(self, telegram_id: int, auth_token: str) -> str:
-        """Authenticate via Telegram and get JWT using the existing AsyncClient."""
-        response = await self.client.post(
+    async def auth_telegram(self, telegram_id: int, auth_token: str, profile: dict | None = None) -> str:
+        """
+        Authenticate via Telegram and get JWT using the shared AsyncClient.
+        ``profile`` (username, first_name, last_name) is stored on the user in the same call.
+        """
+        response = await self._send(
+            "POST",
             "/v1/users/telegram-auth",
-            json={"telegram_id": telegram_id, "auth_token": auth_token},
+            json={"telegram_id": telegram_id, "auth_token": auth_token, **(profile or {})},
+            # Lets the backend rate limit logins per user rather than per bot IP
+            headers={"X-Telegram-Id": str(telegram_id)},
         )
         response.raise_for_status()
         return response.json()["access_token"]
 
-    async def get_active_habits(self) -> list[dict]:
-        """Fetch all active habits."""
-        return await self.request("GET", "/v1/habits/active") or []
+    async def get_me(self) -> dict:
+        """Fetch the current user; cheap way to check the token is still valid."""
+        return await self.request("GET", "/v1/users/me")
+
+    async def get_dashboard(self) -> dict:
+        """Fetch active habits, today's completions and stats in one call; refreshes the habit cache."""
+        dashboard = await self.request("GET", "/v1/dashboard")
+        if self.telegram_id is not None:
+            habit_cache.set(self.telegram_id, dashboard["habits"])
+        return dashboard
+
+    async def get_active_habits(self, fresh: bool = False) -> list[dict]:
+        """Fetch all active habits, served from the per-user cache when fresh; fresh=True always asks the API."""
+        if not fresh and self.telegram_id is not None and (cached := habit_cache.get(self.telegram_id)) is not None:
+            return cached
+        habits = await self.request("GET", "/v1/habits/active") or []
+        if self.telegram_id is not None:
+            habit_cache.set(self.telegram_id, habits)
+        return habits
 
     async def create_habit(self, title: str, description: str | None = None) -> dict:
-        return await self.request("POST", "/v1/habits", json={"title": title, "description": description})
+        habit = await self.request("POST", "/v1/habits", json={"title": title, "description": description})
+        if self.telegram_id is not None:
+            habit_cache.add_habit(self.telegram_id, habit)
+        return habit
 
     async def complete_habit(self, habit_id: int) -> dict:
-        return await self.request("POST", f"/v1/habits/{habit_id}/complete")
+        # Safe to replay: the backend counts at most one completion per habit per day
+        try:
+            habit = await self.request("POST", f"/v1/habits/{habit_id}/complete")
+        except HabitAlreadyCompletedError:
+            if self.telegram_id is not None:
+                habit_cache.invalidate(self.telegram_id)
+            raise
+        if self.telegram_id is not None:
+            habit_cache.update_habit(self.telegram_id, habit)
+        return habit
 
     async def get_habit(self, habit_id: int) -> dict:
+        if self.telegram_id is not None and (cached := habit_cache.get_habit(self.telegram_id, habit_id)) is not None:
+            return cached
         return await self.request("GET", f"/v1/habits/{habit_id}")
 
     async def update_habit(self, habit_id: int, **kwargs) -> dict:
-        return await self.request("PATCH", f"/v1/habits/{habit_id}", json=kwargs)
+        habit = await self.request("PATCH", f"/v1/habits/{habit_id}", json=kwargs)
+        if self.telegram_id is not None:
+            habit_cache.update_habit(self.telegram_id, habit)
+        return habit
 
     async def delete_habit(self, habit_id: int) -> None:
-        return await self.request("DELETE", f"/v1/habits/{habit_id}")
-
-    async def close(self):
-        """Close underlying HTTP connections."""
-        await self.client.aclose()
+        await self.request("DELETE", f"/v1/habits/{habit_id}")
+        if self.telegram_id is not None:
+            habit_cache.remove_habit(self.telegram_id, habit_id)
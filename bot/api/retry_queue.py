@@ -0,0 +1,139 @@
+"""Durable queue of habit completions that failed because the backend was unavailable."""
+
+import asyncio
+import random
+import time
+from contextlib import suppress
+from datetime import UTC, datetime
+
+import httpx
+
+from bot import storage
+from bot.api.circuit_breaker import api_circuit
+from bot.api.client import APIClient
+from bot.config import get_settings
+from bot.exceptions import HabitAlreadyCompletedError, RateLimitedError, ServerError, ServiceUnavailableError
+from bot.logger import log
+from bot.storage.base import PendingCompletion
+
+settings = get_settings()
+
+# Errors after which the same request may succeed later
+TRANSIENT_ERRORS = (ServerError, ServiceUnavailableError, RateLimitedError, httpx.TransportError)
+
+
+class CompletionRetryQueue:
+    """
+    Stores failed completions and replays them in the background.
+
+    Each completion is keyed by (user, habit, UTC day): repeated taps are stored once, and the
+    backend accepts one completion per habit per day, so replaying is idempotent. Retries back
+    off exponentially with full jitter, pause while the circuit breaker is open, and entries
+    from a previous day are dropped instead of being counted for the wrong date. Due entries are
+    claimed for ``lease`` seconds, so replicas sharing the Postgres store never replay one at once.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        max_attempts: int = 20,
+        poll_interval: float = 5.0,
+        batch_size: int = 50,
+        lease: float = 60.0,
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.lease = lease
+        self._task: asyncio.Task | None = None
+
+    def _backoff(self, attempts: int, error: Exception | None = None) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempts))  # noqa: S311
+        if isinstance(error, RateLimitedError):
+            # Retrying before the backend's Retry-After would only be rejected again
+            delay = max(delay, error.retry_after)
+        return delay
+
+    async def enqueue(self, telegram_id: int, habit_id: int, error: Exception | None = None) -> None:
+        """Store a completion that failed with a transient ``error``."""
+        day = datetime.now(UTC).date().isoformat()
+        completion = PendingCompletion(
+            idempotency_key=f"complete:{telegram_id}:{habit_id}:{day}",
+            telegram_id=telegram_id,
+            habit_id=habit_id,
+            day=day,
+        )
+        await storage.add_pending_completion(completion, next_attempt_at=time.time() + self._backoff(0, error))
+
+    async def _replay(self, completion: PendingCompletion) -> None:
+        key = completion.idempotency_key
+        if completion.day != datetime.now(UTC).date().isoformat():
+            log.warning(f"Dropping completion {key}: its day has passed")
+            await storage.delete_pending_completion(key)
+            return
+
+        token = await storage.get_user_token(completion.telegram_id)
+        if token is None:
+            await storage.delete_pending_completion(key)
+            return
+
+        api = APIClient(token, telegram_id=completion.telegram_id)
+        try:
+            await api.complete_habit(completion.habit_id)
+        except HabitAlreadyCompletedError:
+            pass
+        except ServiceUnavailableError:
+            # The circuit opened meanwhile; not this completion's fault, retry once the claim expires
+            return
+        except TRANSIENT_ERRORS as ex:
+            attempts = completion.attempts + 1
+            if attempts >= self.max_attempts:
+                log.error(f"Dropping completion {key} after {attempts} attempts")
+                await storage.delete_pending_completion(key)
+            else:
+                await storage.reschedule_completion(key, attempts, time.time() + self._backoff(attempts, ex))
+            return
+        except Exception:
+            log.exception(f"Dropping completion {key}: the backend rejected it")
+        else:
+            log.info(f"Replayed completion {key}")
+        await storage.delete_pending_completion(key)
+
+    async def replay_due(self) -> None:
+        """Replay the completions whose next attempt is due, stopping if the backend goes down again."""
+        now = time.time()
+        for completion in await storage.claim_due_completions(now, self.batch_size, lease_until=now + self.lease):
+            if api_circuit.is_open:
+                return
+            await self._replay(completion)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if api_circuit.is_open:
+                continue
+            try:
+                await self.replay_due()
+            except Exception:
+                log.exception("Failed to replay pending completions")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+completion_retry_queue = CompletionRetryQueue(
+    base_delay=settings.retry_base_delay,
+    max_delay=settings.retry_max_delay,
+    max_attempts=settings.retry_max_attempts,
+)
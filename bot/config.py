@@ -1,4 +1,5 @@
 from functools import cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,6 +12,63 @@ class Settings(BaseSettings):
 
     telegram_bot_token: str
     api_base_url: str = "http://backend:8000"
+    telegram_auth_key: str = "debug_local_auth"
+    api_max_connections: int = 100
+    api_max_keepalive_connections: int = 20
+    api_http2: bool = False  # requires the h2 package (httpx[http2])
+    # Shared with the backend (X-Bot-Key header) so the bot's single IP is not rate limited as one client
+    bot_service_key: str | None = None
+
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    retry_base_delay: float = 2.0
+    retry_max_delay: float = 300.0
+    retry_max_attempts: int = 20
+
+    bot_mode: Literal["polling", "webhook"] = "polling"
+    webhook_base_url: str | None = None
+    webhook_path: str = "/webhook"
+    webhook_secret: str | None = None
+    webhook_host: str = "0.0.0.0"  # noqa: S104
+    webhook_port: int = 8080
+
+    # Webhook replicas: each update is handled by replica_urls[telegram_id % len(replica_urls)],
+    # the others forward it there. Internal base URLs, in the same order on every replica.
+    replica_urls: list[str] = []
+    replica_index: int = 0
+
+    storage_backend: Literal["sqlite", "postgres"] = "sqlite"
+    storage_postgres_dsn: str | None = None
+
+    flood_global_rate: float = 30.0
+    flood_chat_rate: float = 1.0
+    flood_chat_burst: int = 3
+    flood_max_retries: int = 3
+
+    ordered_updates: bool = True
+    update_concurrency: int = 32
+    update_max_pending: int = 1000
+    # Seconds between queue stats log lines in polling mode (webhook mode serves them on /health); 0 disables
+    queue_stats_interval: float = 60.0
+
+    throttle_callback_window: float = 2.0
+    throttle_message_rate: float = 1.0
+    throttle_message_burst: int = 5
+
+    habit_cache_size: int = 10_000
+    habit_cache_ttl_seconds: float = 30.0
+
+    fsm_max_size: int = 10_000
+    fsm_ttl_seconds: float = 3600.0
+    fsm_persist: bool = False
+    fsm_flush_interval: float = 5.0
+
+    log_json: bool = False
+    log_sampling: dict[str, int] = {}
+
+    @property
+    def webhook_url(self) -> str:
+        return f"{(self.webhook_base_url or '').rstrip('/')}{self.webhook_path}"
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf8", extra="ignore")
 
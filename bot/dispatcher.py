@@ -0,0 +1,130 @@
+"""Dispatcher that processes updates in order within a chat and in parallel across chats."""
+
+import asyncio
+from collections import deque
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiogram.types.update import UpdateTypeLookupError
+
+from bot.logger import log
+
+
+def get_chat_key(update: Update) -> int:
+    """Chat the update belongs to; falls back to the sender, then to the update itself."""
+    try:
+        event = update.event
+    except UpdateTypeLookupError:
+        # A type newer than this aiogram; Dispatcher.feed_update skips it with a warning
+        return -update.update_id
+    chat = getattr(event, "chat", None)
+    if chat is None and (message := getattr(event, "message", None)) is not None:
+        chat = message.chat
+    if chat is not None:
+        return chat.id
+    if (user := getattr(event, "from_user", None)) is not None:
+        return user.id
+    return -update.update_id
+
+
+class OrderedDispatcher(Dispatcher):
+    """
+    ``feed_update`` only enqueues the update; ``max_concurrency`` workers run the handlers.
+
+    A chat is handed to at most one worker at a time, so its updates (and FSM state changes)
+    never interleave. Once ``max_pending`` updates are queued or running, ``feed_update`` blocks, which
+    slows polling down instead of piling up coroutines. Run polling with ``handle_as_tasks=False``
+    and webhook handlers with ``handle_in_background=False``.
+    """
+
+    def __init__(self, *args: Any, max_concurrency: int = 32, max_pending: int = 1000, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        # chat key -> updates waiting; a key is present while the chat is queued or being processed
+        self._chat_queues: dict[int, deque[tuple[Bot, Update, dict[str, Any]]]] = {}
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        self._slots = asyncio.Semaphore(max_pending)
+        self._workers: list[asyncio.Task[None]] = []
+        self._pending = 0
+        self._active = 0
+
+    def queue_stats(self) -> dict[str, Any]:
+        return {
+            "pending": self._pending,
+            "active": self._active,
+            "chats": len(self._chat_queues),
+            "busiest_chat_queue": max((len(queue) for queue in self._chat_queues.values()), default=0),
+            "workers": len(self._workers),
+        }
+
+    async def feed_update(self, bot: Bot, update: Update, **kwargs: Any) -> Any:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+
+        # Before taking a slot: nothing may raise between acquiring it and queueing the update
+        key = get_chat_key(update)
+        await self._slots.acquire()
+        self._pending += 1
+        queue = self._chat_queues.get(key)
+        if queue is None:
+            self._chat_queues[key] = deque([(bot, update, kwargs)])
+            self._ready.put_nowait(key)
+        else:
+            # The worker holding this chat re-queues it when it is done with the current update
+            queue.append((bot, update, kwargs))
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._ready.get()
+            queue = self._chat_queues[key]
+            bot, update, kwargs = queue.popleft()
+            self._pending -= 1
+            self._active += 1
+            try:
+                await super().feed_update(bot, update, **kwargs)
+            except Exception:
+                log.exception(f"Failed to process update {update.update_id}")
+            finally:
+                self._active -= 1
+                self._slots.release()
+                if queue:
+                    # Back of the line, so one busy chat cannot starve the others
+                    self._ready.put_nowait(key)
+                else:
+                    del self._chat_queues[key]
+
+    async def emit_shutdown(self, *args: Any, **kwargs: Any) -> None:
+        # Drain first: shutdown handlers (FSM storage close is registered first) would pull
+        # the storage and HTTP client out from under the updates still being processed
+        await self.close_workers()
+        await super().emit_shutdown(*args, **kwargs)
+
+    async def close_workers(self, timeout: float = 10.0) -> None:
+        """Let queued updates finish (up to ``timeout`` seconds), then stop the workers."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (self._pending or self._active) and loop.time() < deadline:
+            await asyncio.sleep(0.1)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+def get_queue_stats(dp: Dispatcher) -> dict[str, Any]:
+    """Incoming (OrderedDispatcher) and outgoing (flood control) queue statistics; None where not in use."""
+    flood_control = dp.workflow_data.get("flood_control")
+    return {
+        "incoming_queue": dp.queue_stats() if isinstance(dp, OrderedDispatcher) else None,
+        "outgoing_queue": flood_control.stats() if flood_control else None,
+    }
+
+
+async def log_queue_stats(dp: Dispatcher, interval: float) -> None:
+    """Log get_queue_stats every ``interval`` seconds until cancelled; polling mode has no /health to read them."""
+    while True:
+        await asyncio.sleep(interval)
+        log.info(f"Queue stats: {get_queue_stats(dp)}")
@@ -35,3 +35,18 @@ class HabitAlreadyCompletedError(APIError):
 class ServerError(APIError):
     def __init__(self, detail: str | None = None):
         super().__init__(detail or "Internal server error")
+
+
+class RateLimitedError(APIError):
+    """The backend rate limit rejected the call; it may be retried after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after: float = 1.0):
+        super().__init__(f"Too many requests, retry in {retry_after:g}s")
+        self.retry_after = retry_after
+
+
+class ServiceUnavailableError(APIError):
+    """Backend calls are suspended by the circuit breaker."""
+
+    def __init__(self, detail: str | None = None):
+        super().__init__(detail or "Backend is unavailable, try again later")
@@ -0,0 +1,156 @@
+"""Bounded FSM storage with idle expiry and optional persistence to the bot store."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StateType, StorageKey
+
+from bot import storage
+from bot.logger import log
+
+
+@dataclass
+class FSMRecord:
+    state: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    touched_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.state is None and not self.data
+
+
+class BoundedMemoryStorage(BaseStorage):
+    """
+    In-memory FSM storage that keeps at most ``max_size`` records and forgets
+    records that were not touched for ``ttl`` seconds (e.g. abandoned HabitForm flows).
+
+    With ``persist=True`` changes are written behind to the bot store (see bot.storage) every
+    ``flush_interval`` seconds, so in-progress forms survive a restart or move to another replica.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 3600.0,
+        persist: bool = False,
+        flush_interval: float = 5.0,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.persist = persist
+        self.flush_interval = flush_interval
+        self._records: OrderedDict[StorageKey, FSMRecord] = OrderedDict()
+        self._dirty: dict[str, FSMRecord] = {}
+        self._key_builder = DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self._flush_task: asyncio.Task | None = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __bool__(self) -> bool:
+        # Dispatcher(storage=...) falls back to MemoryStorage for a falsy storage; an empty one must not be
+        return True
+
+    def _evict_expired(self) -> None:
+        deadline = time.monotonic() - self.ttl
+        while self._records:
+            oldest = next(iter(self._records.values()))
+            if oldest.touched_at >= deadline:
+                break
+            self._records.popitem(last=False)
+
+    async def _load(self, key: StorageKey) -> FSMRecord:
+        if not self.persist:
+            return FSMRecord()
+
+        storage_key = self._key_builder.build(key)
+        if storage_key in self._dirty:
+            # Evicted before its changes were flushed
+            return self._dirty[storage_key]
+
+        row = await storage.load_fsm_record(storage_key, not_before=time.time() - self.ttl)
+        return FSMRecord(state=row[0], data=row[1]) if row else FSMRecord()
+
+    async def _get_record(self, key: StorageKey) -> FSMRecord:
+        self._evict_expired()
+        record = self._records.get(key)
+        if record is None:
+            loaded = await self._load(key)
+            record = self._records.setdefault(key, loaded)
+            while len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+        else:
+            self._records.move_to_end(key)
+        record.touched_at = time.monotonic()
+        return record
+
+    def _mark_dirty(self, key: StorageKey, record: FSMRecord) -> None:
+        if not self.persist:
+            return
+        self._dirty[self._key_builder.build(key)] = record
+        if self._flush_task is None and not self._closed:
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._get_record(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._mark_dirty(key, record)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        record = await self._get_record(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+        record = await self._get_record(key)
+        record.data = data.copy()
+        self._mark_dirty(key, record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        record = await self._get_record(key)
+        return record.data.copy()
+
+    async def flush(self) -> None:
+        """Write pending changes to the store and drop persisted records idle for longer than ttl."""
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, {}
+        records = [(key, record.state, record.data) for key, record in dirty.items() if not record.is_empty]
+        deleted_keys = [key for key, record in dirty.items() if record.is_empty]
+        try:
+            await storage.save_fsm_records(records, deleted_keys)
+            await storage.delete_expired_fsm_records(older_than=time.time() - self.ttl)
+        except Exception:
+            for key, record in dirty.items():
+                self._dirty.setdefault(key, record)
+            raise
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self._evict_expired()
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to persist FSM state")
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush()
+        self._records.clear()
@@ -1,21 +1,102 @@
+import html
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
 from aiogram import F, Router
-from aiogram.types import CallbackQuery, Message
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
 
 from bot.api.client import APIClient
+from bot.api.retry_queue import TRANSIENT_ERRORS, completion_retry_queue
 from bot.decorators.auth import auth_required
 from bot.exceptions import HabitAlreadyCompletedError
-from bot.keyboards.inline.habits import get_habit_buttons, get_refresh_button
+from bot.keyboards.inline.habits import get_habits_page_keyboard, get_refresh_button
 from bot.logger import log
 
 router = Router(name="habits")
 
 
-async def show_habits_list(target: Message | CallbackQuery, api: APIClient):
+HABITS_PER_PAGE = 5
+MESSAGE_MAX_LENGTH = 4096
+SHOWN_PAGES_LIMIT = 10_000
+
+
+def render_habit(habit: dict, number: int, today: str) -> str:
+    title = html.escape(habit["title"])
+    description = habit.get("description") or ""
+    count = habit["completion_count"]
+    last_completed = (habit.get("last_completed") or "")[:10]
+    status = "Completed" if last_completed == today else "Pending"
+
+    lines = [f"{number}. {status} <b>{title}</b>"]
+    if description:
+        short = description[:100] + ("..." if len(description) > 100 else "")
+        lines.append(f"<i>{html.escape(short)}</i>")
+    lines.append(f"Completed: {count} time{'s' if count != 1 else ''}")
+    return "\n".join(lines)
+
+
+def render_page_header(page: int, total_pages: int) -> str:
+    return f"<b>Your habits</b> (page {page + 1}/{total_pages})"
+
+
+def paginate_habits(habits: list[dict], today: str) -> list[list[dict]]:
+    """Split habits into pages of at most HABITS_PER_PAGE that fit into one Telegram message."""
+    # The header is longest on the last page, so reserve room for it up front
+    header_reserve = len(render_page_header(len(habits), len(habits))) + 2
+    pages: list[list[dict]] = [[]]
+    page_length = header_reserve
+    for habit in habits:
+        block_length = len(render_habit(habit, len(pages[-1]) + 1, today)) + 2
+        if pages[-1] and (len(pages[-1]) >= HABITS_PER_PAGE or page_length + block_length > MESSAGE_MAX_LENGTH):
+            pages.append([])
+            page_length = header_reserve
+            block_length = len(render_habit(habit, 1, today)) + 2
+        pages[-1].append(habit)
+        page_length += block_length
+    return pages
+
+
+def render_page(page_habits: list[dict], page: int, total_pages: int) -> tuple[str, InlineKeyboardMarkup]:
+    today = datetime.now(tz=UTC).date().isoformat()
+    blocks = [render_habit(habit, number, today) for number, habit in enumerate(page_habits, start=1)]
+    text = "\n\n".join([render_page_header(page, total_pages), *blocks])
+    kb = get_habits_page_keyboard(page_habits, page=page, total_pages=total_pages, today=today)
+    return text, kb
+
+
+@dataclass
+class ShownPage:
+    habits: list[dict]
+    page: int
+    total_pages: int
+
+
+# (chat_id, message_id) -> habits currently rendered in that list message, most recent last
+_shown_pages: OrderedDict[tuple[int, int], ShownPage] = OrderedDict()
+
+
+def remember_shown_page(message: Message, shown: ShownPage | None) -> None:
+    key = (message.chat.id, message.message_id)
+    if shown is None:
+        _shown_pages.pop(key, None)
+        return
+    _shown_pages[key] = shown
+    _shown_pages.move_to_end(key)
+    if len(_shown_pages) > SHOWN_PAGES_LIMIT:
+        _shown_pages.popitem(last=False)
+
+
+async def show_habits_list(target: Message | CallbackQuery, api: APIClient, page: int = 0, fresh: bool = False):
+    """
+    Render the habit list as one paginated message; callbacks edit the list message in place.
+    fresh=True skips the habit cache, e.g. for changes made outside the bot.
+    """
     try:
-        habits = await api.get_active_habits()
-        log.debug(f"Loaded {len(habits)} active habits")
+        habits = await api.get_active_habits(fresh=fresh)
+        log.bind(sampled=True).debug(f"Loaded {len(habits)} active habits")
     except Exception:
         log.exception("Failed to load habits")
         text = "Error loading habits"
@@ -25,49 +106,64 @@ async def show_habits_list(target: Message | CallbackQuery, api: APIClient):
             await target.message.edit_text(text)
         return
 
-    today_str = datetime.now(tz=UTC).date()
-
     if not habits:
         text = "You don't have any habits yet!\n\nClick <b>Add Habit</b> to create one."
         kb = get_refresh_button()
-        if isinstance(target, Message):
-            await target.answer(text, reply_markup=kb)
-        else:
-            await target.message.edit_text(text, reply_markup=kb)
+        shown = None
+    else:
+        today = datetime.now(tz=UTC).date().isoformat()
+        pages = paginate_habits(habits, today)
+        page = min(max(page, 0), len(pages) - 1)
+        shown = ShownPage(habits=pages[page], page=page, total_pages=len(pages))
+        text, kb = render_page(shown.habits, shown.page, shown.total_pages)
+
+    if isinstance(target, Message):
+        sent = await target.answer(text, reply_markup=kb)
+        remember_shown_page(sent, shown)
         return
 
-    if isinstance(target, CallbackQuery):
-        await target.message.delete()
+    with suppress(TelegramBadRequest):  # "message is not modified" when nothing changed
+        await target.message.edit_text(text, reply_markup=kb)
+    remember_shown_page(target.message, shown)
+
+
+async def update_shown_habit(cb: CallbackQuery, habit_id: int, habit: dict | None) -> bool:
+    """
+    Re-render only the tapped list message with ``habit`` replacing (or, if None, removing) the entry.
+    Returns False when the page is unknown (e.g. after a restart) and the list has to be reloaded.
+    """
+    shown = _shown_pages.get((cb.message.chat.id, cb.message.message_id))
+    if shown is None or all(item["id"] != habit_id for item in shown.habits):
+        return False
+
+    if habit is None:
+        habits = [item for item in shown.habits if item["id"] != habit_id]
+    else:
+        habits = [habit if item["id"] == habit_id else item for item in shown.habits]
+    if not habits:
+        return False
+
+    shown = ShownPage(habits=habits, page=shown.page, total_pages=shown.total_pages)
+    text, kb = render_page(shown.habits, shown.page, shown.total_pages)
+    with suppress(TelegramBadRequest):
+        await cb.message.edit_text(text, reply_markup=kb)
+    remember_shown_page(cb.message, shown)
+    return True
+
+
+async def remove_reminder_button(cb: CallbackQuery) -> None:
+    """Drop the tapped button from a reminder message, keeping the other habits' buttons."""
+    markup = cb.message.reply_markup
+    if markup is None:
+        return
+    rows = [row for row in markup.inline_keyboard if all(button.callback_data != cb.data for button in row)]
+    with suppress(TelegramBadRequest):
+        await cb.message.edit_reply_markup(reply_markup=InlineKeyboardMarkup(inline_keyboard=rows) if rows else None)
 
-    for habit in habits:
-        habit_id = habit["id"]
-        title = habit["title"]
-        description = habit.get("description", "")
-        count = habit["completion_count"]
-        last_completed_raw = habit.get("last_completed")
-        last_completed = last_completed_raw[:10] if last_completed_raw else ""
-        status = "Completed" if last_completed == today_str else "Pending"
-
-        lines = [f"{status} <b>{title}</b>"]
-
-        if description:
-            short = description[:100] + ("..." if len(description) > 100 else "")
-            lines.append(f"<i>{short}</i>")
-        lines.append(f"Completed: {count} time{'s' if count != 1 else ''}")
-
-        text = "\n".join(lines)
-        kb = get_habit_buttons(habit_id=habit_id, completed_today=(last_completed == today_str))
-        await target.bot.send_message(
-            chat_id=target.from_user.id if isinstance(target, Message) else target.message.chat.id,
-            text=text,
-            reply_markup=kb,
-        )
-
-    await target.bot.send_message(
-        chat_id=target.from_user.id if isinstance(target, Message) else target.message.chat.id,
-        text="↑ Your habits ↑",
-        reply_markup=get_refresh_button(),
-    )
+
+def parse_page(callback_data: str, position: int) -> int:
+    parts = callback_data.split(":")
+    return int(parts[position]) if len(parts) > position else 0
 
 
 @router.message(F.text == "My Habits")
@@ -76,10 +172,17 @@ async def cmd_my_habits(message: Message, api: APIClient | None):
     await show_habits_list(message, api)
 
 
-@router.callback_query(F.data == "refresh_habits")
+@router.callback_query(F.data.startswith("refresh_habits"))
 @auth_required
 async def cb_refresh_habits(cb: CallbackQuery, api: APIClient | None):
-    await show_habits_list(cb, api)
+    await show_habits_list(cb, api, page=parse_page(cb.data, 1), fresh=True)
+    await cb.answer()
+
+
+@router.callback_query(F.data.startswith("habits_page:"))
+@auth_required
+async def cb_habits_page(cb: CallbackQuery, api: APIClient | None):
+    await show_habits_list(cb, api, page=parse_page(cb.data, 1))
     await cb.answer()
 
 
@@ -87,17 +190,32 @@ async def cb_refresh_habits(cb: CallbackQuery, api: APIClient | None):
 @auth_required
 async def cb_complete_habit(cb: CallbackQuery, api: APIClient | None):
     habit_id = int(cb.data.split(":")[1])
+    # Reminder messages from the backend carry plain "complete:<id>"; list pages add the page number
+    from_reminder = cb.data.count(":") == 1
 
     try:
-        await api.complete_habit(habit_id)
-        await cb.answer("Marked as completed!", show_alert=False)
+        habit = await api.complete_habit(habit_id)
     except HabitAlreadyCompletedError:
         await cb.answer("Already completed today!", show_alert=True)
+        if from_reminder:
+            await remove_reminder_button(cb)
+        return
+    except TRANSIENT_ERRORS as ex:
+        log.warning(f"Backend unavailable ({ex}), queueing completion of habit {habit_id}")
+        await completion_retry_queue.enqueue(cb.from_user.id, habit_id, ex)
+        await cb.answer("Server is busy right now. Your completion is saved and will be sent shortly.", show_alert=True)
+        return
     except Exception:
         log.exception("Failed to complete habit")
         await cb.answer("Error", show_alert=True)
+        return
 
-    await show_habits_list(cb, api)
+    await cb.answer("Marked as completed!", show_alert=False)
+    if from_reminder:
+        await remove_reminder_button(cb)
+        return
+    if not await update_shown_habit(cb, habit_id, habit):
+        await show_habits_list(cb, api, page=parse_page(cb.data, 2))
 
 
 @router.callback_query(F.data.startswith("delete:"))
@@ -107,9 +225,11 @@ async def cb_delete_habit(cb: CallbackQuery, api: APIClient | None):
 
     try:
         await api.delete_habit(habit_id)
-        await cb.answer("Habit deleted", show_alert=False)
     except Exception:
         log.exception("Failed to delete habit")
         await cb.answer("Error deleting", show_alert=True)
+        return
 
-    await show_habits_list(cb, api)
+    await cb.answer("Habit deleted", show_alert=False)
+    if not await update_shown_habit(cb, habit_id, None):
+        await show_habits_list(cb, api, page=parse_page(cb.data, 2))
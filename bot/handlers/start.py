@@ -3,9 +3,11 @@ from aiogram.filters import Command
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from bot.api.client import APIClient
+from bot.config import get_settings
 from bot.keyboards.main_kb import main_menu_kb
 from bot.storage import save_user_token
 
+settings = get_settings()
 router = Router(name="start")
 
 
@@ -22,13 +24,13 @@ async def cmd_start(message: Message, bot, api: APIClient | None = None) -> None
 
     if api:
         try:
-            await api.get_active_habits()
+            await api.get_me()
             await message.answer("Welcome back! Use the menu below", reply_markup=main_menu_kb())
             return
         except Exception:  # noqa: S110
             pass
 
-    bot_info = await bot.get_me()
+    bot_info = await bot.me()
     auth_link = f"https://t.me/{bot_info.username}?start=auth"
 
     kb = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text="Login with Telegram", url=auth_link)]])
@@ -44,25 +46,13 @@ async def handle_auth_deep_link(message: Message) -> None:
     telegram_id = message.from_user.id
 
     try:
-        client = APIClient()
-        jwt_token = await client.auth_telegram(
+        jwt_token = await APIClient().auth_telegram(
             telegram_id=telegram_id,
-            auth_token="debug_local_auth",
+            auth_token=settings.telegram_auth_key,
+            profile={"username": user.username, "first_name": user.first_name, "last_name": user.last_name},
         )
         await save_user_token(telegram_id, jwt_token)
 
-        register_client = APIClient(jwt_token)
-        await register_client.request(
-            "POST",
-            "/v1/users/register",
-            json={
-                "telegram_id": user.id,
-                "username": user.username,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-            },
-        )
-
         await message.answer(
             "Successfully authorized! ✅\nNow you can track your habits.",
             reply_markup=main_menu_kb(),
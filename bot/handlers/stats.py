@@ -14,7 +14,8 @@ async def cmd_statistics(message: Message, api: APIClient):
     log.info(f"User {message.from_user.id} requested statistics")
 
     try:
-        stats = await api.request("GET", "/v1/habits/stats")
+        # The dashboard also refreshes the cached habit list for the "My habits" screen
+        stats = (await api.get_dashboard())["stats"]
     except Exception:
         log.exception("Failed to fetch stats")
         await message.answer("Error loading statistics")
@@ -2,16 +2,28 @@ from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 
-def get_habit_buttons(habit_id: int, completed_today: bool = False) -> InlineKeyboardMarkup:
-    """Buttons below the habit."""
+def get_habits_page_keyboard(habits: list[dict], page: int, total_pages: int, today: str) -> InlineKeyboardMarkup:
+    """Buttons for one page of the habit list: a row per habit, then navigation."""
     builder = InlineKeyboardBuilder()
 
-    complete_text = "Completed" if completed_today else "Complete"
-    builder.row(
-        InlineKeyboardButton(text=complete_text, callback_data=f"complete:{habit_id}"),
-        InlineKeyboardButton(text="Edit", callback_data=f"edit:{habit_id}"),
-        InlineKeyboardButton(text="Delete", callback_data=f"delete:{habit_id}"),
-    )
+    for number, habit in enumerate(habits, start=1):
+        habit_id = habit["id"]
+        completed_today = (habit.get("last_completed") or "")[:10] == today
+        complete_text = f"{number}. Completed" if completed_today else f"{number}. Complete"
+        builder.row(
+            InlineKeyboardButton(text=complete_text, callback_data=f"complete:{habit_id}:{page}"),
+            InlineKeyboardButton(text="Edit", callback_data=f"edit:{habit_id}"),
+            InlineKeyboardButton(text="Delete", callback_data=f"delete:{habit_id}:{page}"),
+        )
+
+    navigation = []
+    if page > 0:
+        navigation.append(InlineKeyboardButton(text="« Prev", callback_data=f"habits_page:{page - 1}"))
+    navigation.append(InlineKeyboardButton(text="Refresh", callback_data=f"refresh_habits:{page}"))
+    if page < total_pages - 1:
+        navigation.append(InlineKeyboardButton(text="Next »", callback_data=f"habits_page:{page + 1}"))
+    builder.row(*navigation)
+
     return builder.as_markup()
 
 
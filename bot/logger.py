@@ -3,9 +3,14 @@ from pathlib import Path
 
 from loguru import logger
 
+from bot.config import get_settings
+from common.log_sampling import SamplingFilter
+
 LOG_DIR = Path(__file__).parent.parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
+settings = get_settings()
+
 
 def setup_bot_logger():
     logger.remove()
@@ -19,7 +24,10 @@ def setup_bot_logger():
             "<level>{message}</level>"
         ),
         level="INFO",
-        colorize=True,
+        colorize=not settings.log_json,
+        filter=SamplingFilter(settings.log_sampling),
+        serialize=settings.log_json,
+        enqueue=True,
     )
 
     logger.add(
@@ -30,6 +38,9 @@ def setup_bot_logger():
         level="DEBUG",
         encoding="utf-8",
         format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{line} - {message}",
+        filter=SamplingFilter(settings.log_sampling),
+        serialize=settings.log_json,
+        enqueue=True,  # writes, rotation and zip compression run off the event loop
     )
 
     return logger
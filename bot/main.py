@@ -1,46 +1,178 @@
+import argparse
 import asyncio
+import importlib
 import logging
+import subprocess
+import sys
+from collections import Counter
+from contextlib import suppress
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
-from aiogram.fsm.storage.memory import MemoryStorage
 
+from bot.api.client import close_http_client, init_http_client
+from bot.api.retry_queue import completion_retry_queue
 from bot.config import get_settings
-from bot.handlers import habit_form, habits, start, stats
+from bot.dispatcher import OrderedDispatcher, log_queue_stats
+from bot.fsm_storage import BoundedMemoryStorage
 from bot.logger import log
 from bot.middlewares.auth_middleware import AuthMiddleware
-from bot.storage import init_db
+from bot.middlewares.flood_control import FloodControlMiddleware
+from bot.middlewares.throttling import ThrottlingMiddleware
+from bot.storage import close_db, init_db
 
 settings = get_settings()
 logging.basicConfig(level=logging.CRITICAL)
 
+# Imported when the dispatcher is built, not when bot.main is imported
+HANDLER_MODULES = ("start", "habits", "habit_form", "stats")
+
 
 async def on_startup(bot: Bot) -> None:
     await init_db()
-    log.info("Bot started.")
+    init_http_client()
+    completion_retry_queue.start()
+    # Bot.me() caches the result, so handlers reuse it without another getMe call
+    me = await bot.me()
+    if settings.bot_mode == "webhook":
+        from bot.webhook import set_webhook
+
+        await set_webhook(bot)
+    log.info(f"Bot @{me.username} started.")
 
 
 async def on_shutdown(bot: Bot):
     log.info("Bot shutting down...")
+    await completion_retry_queue.stop()
+    await close_http_client()
+    await close_db()
+    await log.complete()
 
 
-async def main() -> None:
+def include_routers(dp: Dispatcher) -> None:
+    for name in HANDLER_MODULES:
+        module = importlib.import_module(f"bot.handlers.{name}")
+        dp.include_router(module.router)
+
+
+def create_bot_and_dispatcher() -> tuple[Bot, Dispatcher]:
     bot = Bot(token=settings.telegram_bot_token, default=DefaultBotProperties(parse_mode="HTML"))
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+    flood_control = FloodControlMiddleware(
+        global_rate=settings.flood_global_rate,
+        chat_rate=settings.flood_chat_rate,
+        chat_burst=settings.flood_chat_burst,
+        max_retries=settings.flood_max_retries,
+    )
+    bot.session.middleware(flood_control)
+    throttling = ThrottlingMiddleware(
+        callback_window=settings.throttle_callback_window,
+        message_rate=settings.throttle_message_rate,
+        message_burst=settings.throttle_message_burst,
+    )
+    bot.session.middleware(throttling.record_answer)
+    storage = BoundedMemoryStorage(
+        max_size=settings.fsm_max_size,
+        ttl=settings.fsm_ttl_seconds,
+        persist=settings.fsm_persist,
+        flush_interval=settings.fsm_flush_interval,
+    )
+    if settings.ordered_updates:
+        dp = OrderedDispatcher(
+            storage=storage,
+            max_concurrency=settings.update_concurrency,
+            max_pending=settings.update_max_pending,
+        )
+    else:
+        dp = Dispatcher(storage=storage)
+    dp["flood_control"] = flood_control
 
+    # Throttling runs first so dropped and coalesced updates never reach the token lookup
+    dp.update.middleware(throttling)
     dp.update.middleware(AuthMiddleware())
-    dp.include_router(start.router)
-    dp.include_router(habits.router)
-    dp.include_router(habit_form.router)
-    dp.include_router(stats.router)
+    include_routers(dp)
 
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
+    return bot, dp
+
+
+async def main() -> None:
+    bot, dp = create_bot_and_dispatcher()
+
+    if settings.bot_mode == "webhook":
+        from bot.webhook import run_webhook
+
+        log.info("Starting webhook server...")
+        await run_webhook(bot, dp)
+        return
+
+    if len(settings.replica_urls) > 1:
+        msg = "Running several replicas requires BOT_MODE=webhook: Telegram serves getUpdates to one poller only"
+        raise RuntimeError(msg)
 
     log.info("Starting polling...")
-    await dp.start_polling(bot)
+    stats_task = None
+    if settings.queue_stats_interval > 0:
+        stats_task = asyncio.create_task(log_queue_stats(dp, settings.queue_stats_interval))
+    try:
+        # OrderedDispatcher schedules updates itself; polling tasks would only wrap a queue put
+        await dp.start_polling(bot, handle_as_tasks=not settings.ordered_updates)
+    finally:
+        if stats_task is not None:
+            stats_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await stats_task
+
+
+PROFILE_SCRIPT = """
+import resource, time
+started = time.perf_counter()
+from bot.main import create_bot_and_dispatcher
+create_bot_and_dispatcher()
+print(f"{time.perf_counter() - started:.6f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}")
+"""
+
+
+def profile_startup(top: int = 15) -> None:
+    """
+    Build the bot in a fresh interpreter and report cold-start time, peak RSS
+    and import time per top-level package (from ``python -X importtime``).
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", PROFILE_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, max_rss_kb = result.stdout.split()
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    packages: Counter[str] = Counter()
+    modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        packages[name.strip().split(".")[0]] += int(self_us)
+        modules += 1
+
+    print(f"Startup time: {float(elapsed) * 1000:.0f} ms")
+    print(f"Peak RSS: {int(max_rss_kb) / 1024:.1f} MiB")
+    print(f"Modules imported: {modules}")
+    for heavy in ("fastapi", "starlette", "sqlalchemy"):
+        if heavy in packages:
+            print(f"Warning: {heavy} is imported by the bot")
+    print(f"\nSlowest {top} packages (import time):")
+    for package, self_us in packages.most_common(top):
+        print(f"{self_us / 1000:10.1f} ms  {package}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Habit tracker Telegram bot")
+    parser.add_argument("--profile-startup", action="store_true", help="report import time and memory, then exit")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profile_startup()
+    else:
+        asyncio.run(main())
@@ -22,6 +22,6 @@ class AuthMiddleware(BaseMiddleware):
             return await handler(event, data)
 
         token = await get_user_token(telegram_user.id)
-        data["api"] = APIClient(token) if token else None
+        data["api"] = APIClient(token, telegram_id=telegram_user.id) if token else None
         data["raw_token"] = token
         return await handler(event, data)
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+
+from bot.logger import log
+
+
+class TokenBucket:
+    """Async token bucket; waiters are served in FIFO order."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (Telegram asked us to back off)."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now, without waiting."""
+        if self.blocked_until > time.monotonic():
+            return False
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    blocked_for = self.blocked_until - time.monotonic()
+                    if blocked_for > 0:
+                        await asyncio.sleep(blocked_for)
+                        self.updated_at = time.monotonic()
+                        continue
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+
+    @property
+    def is_idle(self) -> bool:
+        self._refill()
+        return self.waiting == 0 and self.tokens >= self.capacity and self.blocked_until <= time.monotonic()
+
+
+class FloodControlMiddleware(BaseRequestMiddleware):
+    """
+    Outgoing request middleware that keeps the bot under Telegram's limits:
+    ``chat_rate`` messages/s per chat (with ``chat_burst``) and ``global_rate`` messages/s overall.
+    Calls without a chat_id (answerCallbackQuery, getUpdates, ...) pass through untouched.
+    A 429 pauses the chat's queue for ``retry_after`` seconds and the call is retried.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: int = 3,
+        max_retries: int = 3,
+        max_chats: int = 10_000,
+        warn_queue_depth: int = 100,
+    ):
+        self.global_bucket = TokenBucket(rate=global_rate, capacity=int(global_rate))
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.max_chats = max_chats
+        self.warn_queue_depth = warn_queue_depth
+        self._chat_buckets: OrderedDict[int | str, TokenBucket] = OrderedDict()
+        self._queued = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of outgoing calls currently waiting for a token."""
+        return self._queued
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self.queue_depth,
+            "queued_global": self.global_bucket.waiting,
+            "chats": len(self._chat_buckets),
+            "busiest_chat_queue": max((bucket.waiting for bucket in self._chat_buckets.values()), default=0),
+        }
+
+    def _get_chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is not None:
+            self._chat_buckets.move_to_end(chat_id)
+            return bucket
+
+        bucket = self._chat_buckets[chat_id] = TokenBucket(rate=self.chat_rate, capacity=self.chat_burst)
+        if len(self._chat_buckets) > self.max_chats:
+            # Forget the least recently used chat that has nothing pending
+            for key, candidate in self._chat_buckets.items():
+                if candidate.is_idle:
+                    del self._chat_buckets[key]
+                    break
+        return bucket
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[Any],
+        bot: Bot,
+        method: TelegramMethod[Any],
+    ) -> Response[Any]:
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        bucket = self._get_chat_bucket(chat_id)
+        if (depth := self.queue_depth) >= self.warn_queue_depth:
+            log.bind(sampled=True).warning(f"Outgoing Telegram queue is backing up: {depth} calls waiting")
+
+        retries = 0
+        while True:
+            self._queued += 1
+            try:
+                await bucket.acquire()
+                await self.global_bucket.acquire()
+            finally:
+                self._queued -= 1
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as ex:
+                retries += 1
+                if retries > self.max_retries:
+                    raise
+                log.warning(f"Flood control on {type(method).__name__} in chat {chat_id}, retry in {ex.retry_after}s")
+                bucket.pause(ex.retry_after)
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import NextRequestMiddlewareType
+from aiogram.methods import AnswerCallbackQuery, Response, TelegramMethod
+from aiogram.types import CallbackQuery, Message, TelegramObject, Update
+
+from bot.logger import log
+from bot.middlewares.flood_control import TokenBucket
+
+
+@dataclass
+class CallbackResult:
+    """What the handler answered to a callback query."""
+
+    text: str | None = None
+    show_alert: bool | None = None
+    expires_at: float = 0.0
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Debounce repeated button taps and rate-limit messages per user.
+
+    Identical callback data from the same user is handled once: taps arriving while the
+    first one is being processed wait for it, and taps within ``callback_window`` seconds
+    after it are answered at once with the same answer. Only callbacks starting with one of
+    ``debounced_prefixes`` (the ones that change data) are debounced; navigation such as
+    paging or Refresh always runs, since repeating it is harmless. Messages are limited to
+    ``message_rate`` per second per user with bursts of ``message_burst``.
+
+    Register ``record_answer`` as a bot session middleware so answers can be reused.
+    """
+
+    def __init__(
+        self,
+        callback_window: float = 2.0,
+        message_rate: float = 1.0,
+        message_burst: int = 5,
+        max_users: int = 10_000,
+        debounced_prefixes: tuple[str, ...] = ("complete:", "delete:"),
+    ):
+        self.callback_window = callback_window
+        self.debounced_prefixes = debounced_prefixes
+        self.message_rate = message_rate
+        self.message_burst = message_burst
+        self.max_users = max_users
+        self._in_flight: dict[tuple[int, str], asyncio.Future[CallbackResult | None]] = {}
+        # callback_query_id -> result being recorded for the handler that owns it
+        self._recording: dict[str, CallbackResult] = {}
+        self._recent: OrderedDict[tuple[int, str], CallbackResult] = OrderedDict()
+        self._message_buckets: OrderedDict[int, TokenBucket] = OrderedDict()
+        self._warned_users: set[int] = set()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if isinstance(event, Update):
+            if event.callback_query and (event.callback_query.data or "").startswith(self.debounced_prefixes):
+                return await self._debounce_callback(handler, event, data, event.callback_query)
+            if event.message and event.message.from_user:
+                return await self._throttle_message(handler, event, data, event.message)
+        return await handler(event, data)
+
+    async def record_answer(
+        self,
+        make_request: NextRequestMiddlewareType[Any],
+        bot: Bot,
+        method: TelegramMethod[Any],
+    ) -> Response[Any]:
+        """Session middleware: remember how handlers answered the callbacks we debounce."""
+        if isinstance(method, AnswerCallbackQuery) and (result := self._recording.get(method.callback_query_id)):
+            result.text = method.text
+            result.show_alert = method.show_alert
+        return await make_request(bot, method)
+
+    def _forget_expired(self) -> None:
+        now = time.monotonic()
+        while self._recent:
+            oldest = next(iter(self._recent.values()))
+            if oldest.expires_at > now:
+                break
+            self._recent.popitem(last=False)
+
+    async def _debounce_callback(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+        callback: CallbackQuery,
+    ) -> Any:
+        key = (callback.from_user.id, callback.data)
+        self._forget_expired()
+
+        if (result := self._recent.get(key)) is not None:
+            await callback.answer(result.text, show_alert=result.show_alert)
+            return None
+
+        if (in_flight := self._in_flight.get(key)) is not None:
+            log.debug(f"Coalescing duplicate callback {callback.data!r} from user {callback.from_user.id}")
+            result = None
+            with suppress(TimeoutError):
+                result = await asyncio.wait_for(asyncio.shield(in_flight), timeout=10)
+            await callback.answer(result.text if result else None, show_alert=result.show_alert if result else None)
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        result = self._recording[callback.id] = CallbackResult()
+        try:
+            response = await handler(event, data)
+        except Exception:
+            future.set_result(None)
+            raise
+        else:
+            result.expires_at = time.monotonic() + self.callback_window
+            self._recent[key] = result
+            future.set_result(result)
+            return response
+        finally:
+            del self._in_flight[key]
+            del self._recording[callback.id]
+
+    def _get_message_bucket(self, user_id: int) -> TokenBucket:
+        bucket = self._message_buckets.get(user_id)
+        if bucket is None:
+            bucket = self._message_buckets[user_id] = TokenBucket(rate=self.message_rate, capacity=self.message_burst)
+            if len(self._message_buckets) > self.max_users:
+                evicted_user_id, _ = self._message_buckets.popitem(last=False)
+                self._warned_users.discard(evicted_user_id)
+        else:
+            self._message_buckets.move_to_end(user_id)
+        return bucket
+
+    async def _throttle_message(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+        message: Message,
+    ) -> Any:
+        user_id = message.from_user.id
+        if self._get_message_bucket(user_id).try_acquire():
+            self._warned_users.discard(user_id)
+            return await handler(event, data)
+
+        if user_id not in self._warned_users:
+            # Tell the user once per burst instead of replying to every dropped message
+            self._warned_users.add(user_id)
+            await message.answer("Too many messages, please slow down.")
+        return None
@@ -0,0 +1,115 @@
+"""
+Token and FSM persistence for the bot.
+
+The backend is chosen by ``STORAGE_BACKEND``: ``sqlite`` (local file, single process) or
+``postgres`` (tables in the backend database, shared by all bot replicas).
+"""
+
+from collections import OrderedDict
+
+from bot.config import get_settings
+from bot.storage.base import PendingCompletion, Store
+
+settings = get_settings()
+
+TOKEN_CACHE_SIZE = 10_000
+
+_store: Store | None = None
+# telegram_id -> jwt_token (None for users known to have no token), most recently used last
+_token_cache: OrderedDict[int, str | None] = OrderedDict()
+
+
+def create_store() -> Store:
+    if settings.storage_backend == "postgres":
+        if not settings.storage_postgres_dsn:
+            msg = "STORAGE_POSTGRES_DSN must be set when STORAGE_BACKEND=postgres"
+            raise RuntimeError(msg)
+        from bot.storage.postgres import PostgresStore
+
+        return PostgresStore(settings.storage_postgres_dsn)
+
+    from bot.storage.sqlite import SQLiteStore
+
+    return SQLiteStore()
+
+
+def _get_store() -> Store:
+    if _store is None:
+        msg = "Storage is not initialized, call init_db() first"
+        raise RuntimeError(msg)
+    return _store
+
+
+def _cache_token(telegram_id: int, jwt_token: str | None) -> None:
+    if jwt_token is None and _get_store().shared:
+        return
+    _token_cache[telegram_id] = jwt_token
+    _token_cache.move_to_end(telegram_id)
+    if len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+
+
+async def init_db(store: Store | None = None) -> None:
+    """Connect the configured store (or ``store``); repeated calls are no-ops."""
+    global _store
+    if _store is not None:
+        return
+    _store = store or create_store()
+    await _store.connect()
+
+
+async def close_db() -> None:
+    """Close the store and drop cached tokens."""
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
+    _token_cache.clear()
+
+
+async def save_user_token(telegram_id: int, jwt_token: str) -> None:
+    await _get_store().save_token(telegram_id, jwt_token)
+    _cache_token(telegram_id, jwt_token)
+
+
+async def get_user_token(telegram_id: int) -> str | None:
+    if telegram_id in _token_cache:
+        _token_cache.move_to_end(telegram_id)
+        return _token_cache[telegram_id]
+
+    token = await _get_store().get_token(telegram_id)
+
+    if telegram_id in _token_cache:
+        # save_user_token ran while we were reading; its value is fresher
+        return _token_cache[telegram_id]
+
+    _cache_token(telegram_id, token)
+    return token
+
+
+async def load_fsm_record(storage_key: str, not_before: float) -> tuple[str | None, dict] | None:
+    return await _get_store().load_fsm_record(storage_key, not_before)
+
+
+async def save_fsm_records(records: list[tuple[str, str | None, dict]], deleted_keys: list[str]) -> None:
+    await _get_store().save_fsm_records(records, deleted_keys)
+
+
+async def delete_expired_fsm_records(older_than: float) -> None:
+    await _get_store().delete_expired_fsm_records(older_than)
+
+
+async def add_pending_completion(completion: PendingCompletion, next_attempt_at: float) -> None:
+    await _get_store().add_pending_completion(completion, next_attempt_at)
+
+
+async def claim_due_completions(now: float, limit: int, lease_until: float) -> list[PendingCompletion]:
+    return await _get_store().claim_due_completions(now, limit, lease_until)
+
+
+async def reschedule_completion(idempotency_key: str, attempts: int, next_attempt_at: float) -> None:
+    await _get_store().reschedule_completion(idempotency_key, attempts, next_attempt_at)
+
+
+async def delete_pending_completion(idempotency_key: str) -> None:
+    await _get_store().delete_pending_completion(idempotency_key)
@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass
+class PendingCompletion:
+    """A habit completion the backend has not accepted yet."""
+
+    idempotency_key: str
+    telegram_id: int
+    habit_id: int
+    day: str  # UTC date of the tap, ISO format
+    attempts: int = 0
+
+
+class Store(ABC):
+    """
+    Where the bot keeps JWTs, persisted FSM state and completions waiting to be retried.
+
+    ``shared`` stores are used by several bot replicas at once, so a replica must not
+    remember that a user has no token: another replica may have logged them in since.
+    """
+
+    shared: bool = False
+
+    @abstractmethod
+    async def connect(self) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+    @abstractmethod
+    async def get_token(self, telegram_id: int) -> str | None: ...
+
+    @abstractmethod
+    async def save_token(self, telegram_id: int, jwt_token: str) -> None: ...
+
+    @abstractmethod
+    async def load_fsm_record(self, storage_key: str, not_before: float) -> tuple[str | None, dict] | None:
+        """Load persisted FSM state and data written after ``not_before`` (unix time)."""
+
+    @abstractmethod
+    async def save_fsm_records(self, records: list[tuple[str, str | None, dict]], deleted_keys: list[str]) -> None:
+        """Upsert (storage_key, state, data) records and delete the given keys in one transaction."""
+
+    @abstractmethod
+    async def delete_expired_fsm_records(self, older_than: float) -> None: ...
+
+    @abstractmethod
+    async def add_pending_completion(self, completion: PendingCompletion, next_attempt_at: float) -> None:
+        """Queue a completion; a completion with the same idempotency key is kept as is."""
+
+    @abstractmethod
+    async def claim_due_completions(self, now: float, limit: int, lease_until: float) -> list[PendingCompletion]:
+        """
+        Completions whose next attempt is due, oldest first. Claimed ones are not due again
+        before ``lease_until``, so replicas polling the same store never replay the same row
+        at once; a replica that dies mid-replay leaves its claims to expire.
+        """
+
+    @abstractmethod
+    async def reschedule_completion(self, idempotency_key: str, attempts: int, next_attempt_at: float) -> None: ...
+
+    @abstractmethod
+    async def delete_pending_completion(self, idempotency_key: str) -> None: ...
@@ -0,0 +1,124 @@
+import json
+import time
+
+import asyncpg
+
+from bot.storage.base import PendingCompletion, Store
+
+
+class PostgresStore(Store):
+    """
+    Tables in the backend database (created by its Alembic migrations),
+    so every bot replica sees the same tokens and FSM state.
+    """
+
+    shared = True
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool: asyncpg.Pool | None = None
+
+    def _get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            msg = "Storage is not initialized, call init_db() first"
+            raise RuntimeError(msg)
+        return self._pool
+
+    async def connect(self) -> None:
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(self.dsn, min_size=self.min_size, max_size=self.max_size)
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def get_token(self, telegram_id: int) -> str | None:
+        return await self._get_pool().fetchval(
+            "SELECT jwt_token FROM bot_user_tokens WHERE telegram_id = $1", telegram_id
+        )
+
+    async def save_token(self, telegram_id: int, jwt_token: str) -> None:
+        await self._get_pool().execute(
+            """
+            INSERT INTO bot_user_tokens (telegram_id, jwt_token, updated_at) VALUES ($1, $2, now())
+            ON CONFLICT (telegram_id) DO UPDATE SET jwt_token = excluded.jwt_token, updated_at = excluded.updated_at
+            """,
+            telegram_id,
+            jwt_token,
+        )
+
+    async def load_fsm_record(self, storage_key: str, not_before: float) -> tuple[str | None, dict] | None:
+        row = await self._get_pool().fetchrow(
+            "SELECT state, data FROM bot_fsm_states WHERE storage_key = $1 AND updated_at >= to_timestamp($2)",
+            storage_key,
+            not_before,
+        )
+        return (row["state"], json.loads(row["data"])) if row else None
+
+    async def save_fsm_records(self, records: list[tuple[str, str | None, dict]], deleted_keys: list[str]) -> None:
+        now = time.time()
+        async with self._get_pool().acquire() as connection, connection.transaction():
+            if records:
+                await connection.executemany(
+                    """
+                    INSERT INTO bot_fsm_states (storage_key, state, data, updated_at)
+                    VALUES ($1, $2, $3::jsonb, to_timestamp($4))
+                    ON CONFLICT (storage_key) DO UPDATE
+                    SET state = excluded.state, data = excluded.data, updated_at = excluded.updated_at
+                    """,
+                    [(storage_key, state, json.dumps(data), now) for storage_key, state, data in records],
+                )
+            if deleted_keys:
+                await connection.execute("DELETE FROM bot_fsm_states WHERE storage_key = ANY($1::text[])", deleted_keys)
+
+    async def delete_expired_fsm_records(self, older_than: float) -> None:
+        await self._get_pool().execute("DELETE FROM bot_fsm_states WHERE updated_at < to_timestamp($1)", older_than)
+
+    async def add_pending_completion(self, completion: PendingCompletion, next_attempt_at: float) -> None:
+        await self._get_pool().execute(
+            """
+            INSERT INTO bot_pending_completions (idempotency_key, telegram_id, habit_id, day, attempts, next_attempt_at)
+            VALUES ($1, $2, $3, $4, $5, to_timestamp($6))
+            ON CONFLICT (idempotency_key) DO NOTHING
+            """,
+            completion.idempotency_key,
+            completion.telegram_id,
+            completion.habit_id,
+            completion.day,
+            completion.attempts,
+            next_attempt_at,
+        )
+
+    async def claim_due_completions(self, now: float, limit: int, lease_until: float) -> list[PendingCompletion]:
+        rows = await self._get_pool().fetch(
+            """
+            UPDATE bot_pending_completions SET next_attempt_at = to_timestamp($3)
+            WHERE idempotency_key IN (
+                SELECT idempotency_key FROM bot_pending_completions
+                WHERE next_attempt_at <= to_timestamp($1) ORDER BY next_attempt_at LIMIT $2
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING idempotency_key, telegram_id, habit_id, day, attempts
+            """,
+            now,
+            limit,
+            lease_until,
+        )
+        return [PendingCompletion(**row) for row in rows]
+
+    async def reschedule_completion(self, idempotency_key: str, attempts: int, next_attempt_at: float) -> None:
+        await self._get_pool().execute(
+            "UPDATE bot_pending_completions SET attempts = $2, next_attempt_at = to_timestamp($3) "
+            "WHERE idempotency_key = $1",
+            idempotency_key,
+            attempts,
+            next_attempt_at,
+        )
+
+    async def delete_pending_completion(self, idempotency_key: str) -> None:
+        await self._get_pool().execute(
+            "DELETE FROM bot_pending_completions WHERE idempotency_key = $1", idempotency_key
+        )
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import aiosqlite
+
+from bot.storage.base import PendingCompletion, Store
+
+DB_PATH = Path(__file__).parent.parent.parent / "data" / "bot.db"
+
+
+class SQLiteStore(Store):
+    """Local SQLite file; only usable by a single bot process."""
+
+    def __init__(self, path: Path = DB_PATH):
+        self.path = path
+        self._connection: aiosqlite.Connection | None = None
+        # Select-then-update claims must not interleave on the shared connection
+        self._claim_lock = asyncio.Lock()
+
+    def _get_connection(self) -> aiosqlite.Connection:
+        if self._connection is None:
+            msg = "Storage is not initialized, call init_db() first"
+            raise RuntimeError(msg)
+        return self._connection
+
+    async def connect(self) -> None:
+        """Open the long-lived SQLite connection and create tables if not exist."""
+        if self._connection is not None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = await aiosqlite.connect(self.path)
+        await self._connection.execute("PRAGMA journal_mode=WAL")
+        await self._connection.execute("PRAGMA synchronous=NORMAL")
+        await self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_tokens (
+                telegram_id INTEGER PRIMARY KEY,
+                jwt_token TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fsm_states (
+                storage_key TEXT PRIMARY KEY,
+                state TEXT,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        await self._connection.execute("CREATE INDEX IF NOT EXISTS ix_fsm_states_updated_at ON fsm_states (updated_at)")
+        await self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pending_completions (
+                idempotency_key TEXT PRIMARY KEY,
+                telegram_id INTEGER NOT NULL,
+                habit_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL
+            )
+            """
+        )
+        await self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_pending_completions_next_attempt_at ON pending_completions (next_attempt_at)"
+        )
+        await self._connection.commit()
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def get_token(self, telegram_id: int) -> str | None:
+        async with self._get_connection().execute(
+            "SELECT jwt_token FROM user_tokens WHERE telegram_id = ?", (telegram_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def save_token(self, telegram_id: int, jwt_token: str) -> None:
+        db = self._get_connection()
+        await db.execute(
+            "INSERT OR REPLACE INTO user_tokens (telegram_id, jwt_token) VALUES (?, ?)",
+            (telegram_id, jwt_token),
+        )
+        await db.commit()
+
+    async def load_fsm_record(self, storage_key: str, not_before: float) -> tuple[str | None, dict] | None:
+        async with self._get_connection().execute(
+            "SELECT state, data FROM fsm_states WHERE storage_key = ? AND updated_at >= ?", (storage_key, not_before)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    async def save_fsm_records(self, records: list[tuple[str, str | None, dict]], deleted_keys: list[str]) -> None:
+        db = self._get_connection()
+        now = time.time()
+        if records:
+            await db.executemany(
+                "INSERT OR REPLACE INTO fsm_states (storage_key, state, data, updated_at) VALUES (?, ?, ?, ?)",
+                [(storage_key, state, json.dumps(data), now) for storage_key, state, data in records],
+            )
+        if deleted_keys:
+            await db.executemany("DELETE FROM fsm_states WHERE storage_key = ?", [(key,) for key in deleted_keys])
+        await db.commit()
+
+    async def delete_expired_fsm_records(self, older_than: float) -> None:
+        db = self._get_connection()
+        await db.execute("DELETE FROM fsm_states WHERE updated_at < ?", (older_than,))
+        await db.commit()
+
+    async def add_pending_completion(self, completion: PendingCompletion, next_attempt_at: float) -> None:
+        db = self._get_connection()
+        await db.execute(
+            """
+            INSERT OR IGNORE INTO pending_completions
+                (idempotency_key, telegram_id, habit_id, day, attempts, next_attempt_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                completion.idempotency_key,
+                completion.telegram_id,
+                completion.habit_id,
+                completion.day,
+                completion.attempts,
+                next_attempt_at,
+            ),
+        )
+        await db.commit()
+
+    async def claim_due_completions(self, now: float, limit: int, lease_until: float) -> list[PendingCompletion]:
+        db = self._get_connection()
+        async with self._claim_lock:
+            async with db.execute(
+                """
+                SELECT idempotency_key, telegram_id, habit_id, day, attempts FROM pending_completions
+                WHERE next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?
+                """,
+                (now, limit),
+            ) as cursor:
+                rows = await cursor.fetchall()
+            await db.executemany(
+                "UPDATE pending_completions SET next_attempt_at = ? WHERE idempotency_key = ?",
+                [(lease_until, row[0]) for row in rows],
+            )
+            await db.commit()
+        return [PendingCompletion(*row) for row in rows]
+
+    async def reschedule_completion(self, idempotency_key: str, attempts: int, next_attempt_at: float) -> None:
+        db = self._get_connection()
+        await db.execute(
+            "UPDATE pending_completions SET attempts = ?, next_attempt_at = ? WHERE idempotency_key = ?",
+            (attempts, next_attempt_at, idempotency_key),
+        )
+        await db.commit()
+
+    async def delete_pending_completion(self, idempotency_key: str) -> None:
+        db = self._get_connection()
+        await db.execute("DELETE FROM pending_completions WHERE idempotency_key = ?", (idempotency_key,))
+        await db.commit()
@@ -0,0 +1,127 @@
+"""Webhook mode: receive Telegram updates over HTTP and feed them into the Dispatcher."""
+
+import asyncio
+from typing import Any
+
+import aiohttp
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from bot.config import get_settings
+from bot.dispatcher import get_queue_stats
+from bot.logger import log
+
+settings = get_settings()
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"  # noqa: S105
+# Set on updates another replica forwarded to us, so they are never forwarded again
+FORWARDED_HEADER = "X-Bot-Forwarded-Update"
+
+
+def get_update_telegram_id(update: dict[str, Any]) -> int | None:
+    """Id of the user who caused a raw update (message, callback_query, ...)."""
+    for value in update.values():
+        if isinstance(value, dict) and (user := value.get("from")):
+            return user["id"]
+    return None
+
+
+def get_replica_index(telegram_id: int) -> int:
+    return telegram_id % len(settings.replica_urls)
+
+
+class ShardedRequestHandler(SimpleRequestHandler):
+    """
+    Webhook handler for several bot replicas behind one URL.
+
+    Every user belongs to one replica (``get_replica_index``), which keeps their updates in
+    order and their in-memory FSM and caches warm. An update that reaches another replica
+    is forwarded to the owner; if the owner cannot be reached it is handled locally, which
+    is safe because tokens and persisted FSM state live in the shared store.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if not self.verify_secret(request.headers.get(SECRET_HEADER, ""), self.bot):
+            return web.Response(body="Unauthorized", status=401)
+
+        if len(settings.replica_urls) > 1 and FORWARDED_HEADER not in request.headers:
+            telegram_id = get_update_telegram_id(await request.json())
+            owner = get_replica_index(telegram_id) if telegram_id is not None else settings.replica_index
+            if owner != settings.replica_index and await self._forward(owner, await request.read()):
+                return web.json_response({})
+        return await super().handle(request)
+
+    async def _forward(self, owner: int, body: bytes) -> bool:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+        url = f"{settings.replica_urls[owner].rstrip('/')}{settings.webhook_path}"
+        headers = {"Content-Type": "application/json", FORWARDED_HEADER: "1", SECRET_HEADER: settings.webhook_secret}
+        try:
+            async with self._session.post(url, data=body, headers=headers) as response:
+                response.raise_for_status()
+        except (aiohttp.ClientError, TimeoutError) as ex:
+            log.warning(f"Replica {owner} is unreachable ({ex!r}), handling the update here")
+            return False
+        return True
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        await super().close()
+
+
+async def health_check(request: web.Request) -> web.Response:
+    dp: Dispatcher = request.app["dispatcher"]
+    return web.json_response({"status": "ok", **get_queue_stats(dp)})
+
+
+def create_webhook_app(bot: Bot, dp: Dispatcher) -> web.Application:
+    """Build the aiohttp application serving the webhook endpoint and a health check."""
+    app = web.Application()
+    app["dispatcher"] = dp
+    # Not in background: feed_update only queues the update, and when the dispatcher is full a slow
+    # reply makes Telegram back off instead of every request parking its own task on a slot
+    ShardedRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=settings.webhook_secret, handle_in_background=False
+    ).register(app, path=settings.webhook_path)
+    app.router.add_get("/health", health_check)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def set_webhook(bot: Bot) -> None:
+    """Point Telegram at this deployment (the load balancer in front of all replicas); safe to repeat."""
+    await bot.set_webhook(
+        url=settings.webhook_url,
+        secret_token=settings.webhook_secret,
+        allowed_updates=["message", "callback_query"],
+    )
+    log.info(f"Webhook set → {settings.webhook_url}")
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher) -> None:
+    """Serve webhook requests until cancelled."""
+    if not settings.webhook_base_url:
+        msg = "WEBHOOK_BASE_URL must be set when BOT_MODE=webhook"
+        raise RuntimeError(msg)
+    if not settings.webhook_secret:
+        # Without it anyone who finds the URL can post fake updates
+        msg = "WEBHOOK_SECRET must be set when BOT_MODE=webhook"
+        raise RuntimeError(msg)
+
+    runner = web.AppRunner(create_webhook_app(bot, dp))
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.webhook_host, port=settings.webhook_port)
+    await site.start()
+    log.info(f"Listening for webhook updates on {settings.webhook_host}:{settings.webhook_port}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
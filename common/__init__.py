@@ -0,0 +1 @@
+"""Code shared by the bot and the backend; must not depend on either of them."""
@@ -0,0 +1,24 @@
+from collections import defaultdict
+
+
+class SamplingFilter:
+    """
+    Loguru filter keeping only every N-th record for hot messages.
+
+    Applies to records logged via ``logger.bind(sampled=True)``; the rate is taken per level
+    from the ``log_sampling`` setting (e.g. ``{"INFO": 100}``). Other records always pass.
+    """
+
+    def __init__(self, rates: dict[str, int]):
+        self.rates = {level.upper(): rate for level, rate in rates.items()}
+        self.counters: dict[str, int] = defaultdict(int)
+
+    def __call__(self, record) -> bool:
+        if not record["extra"].get("sampled"):
+            return True
+        level = record["level"].name
+        rate = self.rates.get(level, 1)
+        if rate <= 1:
+            return True
+        self.counters[level] += 1
+        return self.counters[level] % rate == 1
@@ -0,0 +1,49 @@
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.habit import Habit
+
+
+@pytest.mark.dashboard_routes
+class TestDashboardRoutes:
+    """Test cases for dashboard endpoint."""
+
+    async def test_get_dashboard_empty(self, client: AsyncClient, access_token: str) -> None:
+        response = await client.get("/v1/dashboard", headers={"Authorization": f"Bearer {access_token}"})
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["habits"] == []
+        assert data["completed_today_ids"] == []
+        assert data["stats"]["total_active_habits"] == 0
+        assert data["stats"]["best_habit"] is None
+
+    async def test_get_dashboard(
+        self, client: AsyncClient, db_session: AsyncSession, test_habits: list[Habit], access_token: str
+    ) -> None:
+        """Test that the dashboard lists active habits, today's completions and stats."""
+        done, _, inactive = test_habits
+        done.last_completed = datetime.now(UTC)
+        done.completion_count = 4
+        inactive.completion_count = 1
+        await db_session.flush()
+
+        response = await client.get("/v1/dashboard", headers={"Authorization": f"Bearer {access_token}"})
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["date"] == datetime.now(UTC).date().isoformat()
+        assert [habit["id"] for habit in data["habits"]] == [habit.id for habit in test_habits if habit.is_active]
+        assert data["completed_today_ids"] == [done.id]
+        assert data["stats"]["completed_today"] == 1
+        assert data["stats"]["current_streak_days"] == 1
+        assert data["stats"]["total_completions_all_time"] == 5
+        assert data["stats"]["best_habit"] == done.title
+
+    async def test_get_dashboard_unauthorized(self, client: AsyncClient) -> None:
+        response = await client.get("/v1/dashboard")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
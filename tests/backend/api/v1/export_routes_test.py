@@ -0,0 +1,139 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.habit import Habit, HabitCompletion
+from backend.models.user import User
+
+
+@pytest.fixture
+async def other_user_habit(db_session: AsyncSession) -> Habit:
+    user = User(telegram_id=987654321, username="other", is_active=True)
+    db_session.add(user)
+    await db_session.flush()
+    habit = Habit(user_id=user.id, title="Other habit", is_active=True, completion_count=2)
+    db_session.add(habit)
+    await db_session.flush()
+    return habit
+
+
+@pytest.fixture
+async def test_completions(db_session: AsyncSession, test_habits: list[Habit]) -> list[HabitCompletion]:
+    completions = [
+        HabitCompletion(habit_id=test_habits[0].id, user_id=test_habits[0].user_id, completed_on=date(2024, 1, 1)),
+        HabitCompletion(habit_id=test_habits[1].id, user_id=test_habits[1].user_id, completed_on=date(2024, 1, 2)),
+    ]
+    db_session.add_all(completions)
+    await db_session.flush()
+    return completions
+
+
+@pytest.mark.export_routes
+class TestExportRoutes:
+    """Test cases for habit export endpoints."""
+
+    async def test_export_ndjson(
+        self, client: AsyncClient, test_habits: list[Habit], other_user_habit: Habit, access_token: str
+    ) -> None:
+        response = await client.get("/v1/habits/export", headers={"Authorization": f"Bearer {access_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="habits.ndjson"' in response.headers["content-disposition"]
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert {row["kind"] for row in rows} == {"habit"}
+        assert [row["id"] for row in rows] == [habit.id for habit in test_habits]
+        assert rows[0]["title"] == "Habit 1"
+        assert rows[0]["telegram_id"] == 123456789
+        assert rows[2]["is_active"] is False
+        assert rows[0]["last_completed"] is None
+
+    async def test_export_csv_gzip(self, client: AsyncClient, test_habits: list[Habit], access_token: str) -> None:
+        # A batch size smaller than the row count makes the export span several cursor fetches
+        with patch("backend.services.export_service.EXPORT_BATCH_SIZE", 2):
+            response = await client.get(
+                "/v1/habits/export",
+                params={"format": "csv", "gzip": True},
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/gzip"
+        assert 'filename="habits.csv.gz"' in response.headers["content-disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+        assert [row["title"] for row in rows] == ["Habit 1", "Habit 2", "Habit 3"]
+        assert rows[2]["is_active"] == "False"
+
+    async def test_export_ndjson_includes_completions(
+        self,
+        client: AsyncClient,
+        test_completions: list[HabitCompletion],
+        other_user_habit: Habit,
+        access_token: str,
+    ) -> None:
+        response = await client.get("/v1/habits/export", headers={"Authorization": f"Bearer {access_token}"})
+        assert response.status_code == status.HTTP_200_OK
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        completions = [row for row in rows if row["kind"] == "completion"]
+        assert [(row["id"], row["habit_id"], row["completed_on"]) for row in completions] == [
+            (completion.id, completion.habit_id, completion.completed_on.isoformat()) for completion in test_completions
+        ]
+        assert rows[-len(completions) :] == completions
+
+    async def test_export_completions_csv(
+        self, client: AsyncClient, test_completions: list[HabitCompletion], access_token: str
+    ) -> None:
+        response = await client.get(
+            "/v1/habits/export",
+            params={"format": "csv", "include": "completions"},
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert 'filename="completions.csv"' in response.headers["content-disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [(int(row["habit_id"]), row["completed_on"]) for row in rows] == [
+            (completion.habit_id, completion.completed_on.isoformat()) for completion in test_completions
+        ]
+        assert rows[0]["telegram_id"] == "123456789"
+
+    async def test_export_unauthorized(self, client: AsyncClient) -> None:
+        response = await client.get("/v1/habits/export")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_admin_export_all_users(
+        self,
+        client: AsyncClient,
+        test_habits: list[Habit],
+        test_completions: list[HabitCompletion],
+        other_user_habit: Habit,
+    ) -> None:
+        with patch("backend.api.v1.admin.settings.admin_api_key", "admin-key"):
+            response = await client.get("/v1/admin/habits/export", headers={"X-Admin-Key": "admin-key"})
+        assert response.status_code == status.HTTP_200_OK
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        exported_ids = {row["id"] for row in rows if row["kind"] == "habit"}
+        assert {habit.id for habit in [*test_habits, other_user_habit]} <= exported_ids
+        completion_ids = {row["id"] for row in rows if row["kind"] == "completion"}
+        assert {completion.id for completion in test_completions} <= completion_ids
+
+    @pytest.mark.parametrize(
+        ("configured_key", "headers"),
+        [(None, {"X-Admin-Key": "admin-key"}), ("admin-key", {}), ("admin-key", {"X-Admin-Key": "wrong"})],
+    )
+    async def test_admin_export_requires_key(
+        self, client: AsyncClient, configured_key: str | None, headers: dict[str, str]
+    ) -> None:
+        with patch("backend.api.v1.admin.settings.admin_api_key", configured_key):
+            response = await client.get("/v1/admin/habits/export", headers=headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
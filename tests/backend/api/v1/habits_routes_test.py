@@ -1,8 +1,12 @@
+from datetime import UTC, datetime
+
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models.habit import Habit
+from backend.models.habit import Habit, HabitCompletion
 from backend.models.user import User
 
 
@@ -241,6 +245,21 @@ class TestHabitsRoutes:
         assert data["title"] == test_habit.title
         assert data["user_id"] == test_habit.user_id
 
+    async def test_complete_habit_records_completion(
+        self, client: AsyncClient, db_session: AsyncSession, test_habit: Habit, access_token: str
+    ) -> None:
+        """Test that completing a habit is kept in the completion history."""
+        response = await client.post(
+            f"/v1/habits/{test_habit.id}/complete",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        completions = (
+            await db_session.scalars(select(HabitCompletion).where(HabitCompletion.habit_id == test_habit.id))
+        ).all()
+        assert [(c.user_id, c.completed_on) for c in completions] == [(test_habit.user_id, datetime.now(UTC).date())]
+
     async def test_complete_habit_unauthorized(self, client: AsyncClient, test_habit: Habit) -> None:
         """Test completing a habit without authentication."""
         response = await client.post(f"/v1/habits/{test_habit.id}/complete")
@@ -1,6 +1,10 @@
+from datetime import UTC, datetime
+
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models.user import User
 
@@ -25,3 +29,113 @@ class TestUsersRoutes:
         response = await client.post("/v1/users/telegram-auth", json=auth_data)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert response.json() == {"detail": "Invalid telegram_id or auth_token"}
+
+    async def test_telegram_auth_updates_profile(
+        self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ) -> None:
+        """Test that a login with auth_token stores the profile sent along with it."""
+        auth_data = {
+            "telegram_id": test_user.telegram_id,
+            "auth_token": test_user.auth_token,
+            "username": "renamed",
+            "last_name": "Newlast",
+        }
+        response = await client.post("/v1/users/telegram-auth", json=auth_data)
+        assert response.status_code == status.HTTP_200_OK
+
+        await db_session.refresh(test_user)
+        assert test_user.username == "renamed"
+        assert test_user.last_name == "Newlast"
+        assert test_user.first_name == "Jane"
+
+    async def test_telegram_auth_invalid_token_keeps_profile(
+        self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ) -> None:
+        """Test that a rejected login does not touch the stored profile."""
+        username = test_user.username
+        auth_data = {"telegram_id": test_user.telegram_id, "auth_token": "wrong-token", "username": "hijacked"}
+        response = await client.post("/v1/users/telegram-auth", json=auth_data)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        await db_session.refresh(test_user)
+        assert test_user.username == username
+
+    async def test_telegram_auth_debug_upserts_profile(self, client: AsyncClient, db_session: AsyncSession) -> None:
+        """Test that debug login creates the user with the sent profile and returns a token."""
+        auth_data = {
+            "telegram_id": 555000222,
+            "auth_token": "debug_local_auth",
+            "username": "fresh",
+            "first_name": "Fresh",
+        }
+        response = await client.post("/v1/users/telegram-auth", json=auth_data)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["access_token"]
+
+        user = await db_session.scalar(select(User).where(User.telegram_id == 555000222))
+        assert user is not None
+        assert user.username == "fresh"
+        assert user.first_name == "Fresh"
+
+    async def test_register_new_user(self, client: AsyncClient) -> None:
+        """Test registering a new Telegram user."""
+        user_data = {"telegram_id": 555000111, "username": "newbie", "first_name": "New"}
+        response = await client.post("/v1/users/register", json=user_data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        data = response.json()
+        assert data["telegram_id"] == 555000111
+        assert data["username"] == "newbie"
+        assert data["first_name"] == "New"
+        assert data["is_active"] is True
+        assert data["auth_token"]
+
+    async def test_register_existing_user_updates_profile(self, client: AsyncClient, test_user: User) -> None:
+        """Test that registering an existing user updates only the provided fields."""
+        user_data = {"telegram_id": test_user.telegram_id, "first_name": "Janet"}
+        response = await client.post("/v1/users/register", json=user_data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        data = response.json()
+        assert data["id"] == test_user.id
+        assert data["first_name"] == "Janet"
+        assert data["username"] == test_user.username
+        assert data["auth_token"] == test_user.auth_token
+
+    async def test_register_existing_user_unchanged(self, client: AsyncClient, test_user: User) -> None:
+        """Test that registering an existing user with the same profile returns the stored user."""
+        user_data = {"telegram_id": test_user.telegram_id, "username": test_user.username}
+        response = await client.post("/v1/users/register", json=user_data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        data = response.json()
+        assert data["id"] == test_user.id
+        assert data["auth_token"] == test_user.auth_token
+
+    async def test_get_me(self, client: AsyncClient, test_user: User, access_token: str) -> None:
+        """Test that /me returns the owner of the token."""
+        response = await client.get("/v1/users/me", headers={"Authorization": f"Bearer {access_token}"})
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["id"] == test_user.id
+        assert data["telegram_id"] == test_user.telegram_id
+
+    async def test_get_me_invalid_token(self, client: AsyncClient) -> None:
+        """Test that /me rejects an invalid token."""
+        response = await client.get("/v1/users/me", headers={"Authorization": "Bearer invalid"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_login_reenables_notifications(
+        self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ) -> None:
+        """Test that logging in again clears notifications_disabled_at set for a blocked chat."""
+        test_user.notifications_disabled_at = datetime.now(UTC)
+        await db_session.flush()
+
+        auth_data = {"telegram_id": test_user.telegram_id, "auth_token": "debug_local_auth"}
+        response = await client.post("/v1/users/telegram-auth", json=auth_data)
+        assert response.status_code == status.HTTP_200_OK
+
+        await db_session.refresh(test_user)
+        assert test_user.notifications_disabled_at is None
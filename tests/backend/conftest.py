@@ -1,11 +1,14 @@
 from collections.abc import AsyncGenerator
+from unittest.mock import patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from backend.core.config import settings
-from backend.db.session import get_db
+from backend.core.rate_limit import rate_limiter
+from backend.db.engine import get_read_engine
+from backend.db.session import get_db, get_read_db, get_read_snapshot_db
 from backend.main import app
 from backend.models.habit import Habit
 from backend.models.user import User
@@ -20,6 +23,16 @@ async def async_engine():
     await engine.dispose()
 
 
+@pytest.fixture
+async def read_session_factory() -> AsyncGenerator[async_sessionmaker]:
+    """The production read session factory (autocommit, read-only), pointed at the test database."""
+    engine = get_read_engine(TEST_DB_URL)
+    factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    with patch("backend.db.session.ReadSessionLocal", factory):
+        yield factory
+    await engine.dispose()
+
+
 @pytest.fixture
 async def db_session(async_engine):
     """Фикстура сессии + автоматический откат после теста."""
@@ -45,6 +58,9 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient]:
         return db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_snapshot_db] = override_get_db
+    rate_limiter.clear()
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
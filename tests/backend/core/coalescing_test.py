@@ -0,0 +1,106 @@
+import asyncio
+from typing import Annotated
+
+import pytest
+from fastapi import FastAPI, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from backend.core.coalescing import CoalescingMiddleware
+
+
+@pytest.fixture
+def calls() -> list[str]:
+    return []
+
+
+@pytest.fixture
+async def coalescing_client(calls: list[str]):
+    app = FastAPI()
+
+    @app.get("/habits")
+    async def habits(status_filter: str = "all"):
+        calls.append(status_filter)
+        await asyncio.sleep(0.05)
+        return {"calls": len(calls)}
+
+    @app.post("/habits")
+    async def create_habit():
+        calls.append("post")
+        return {"ok": True}
+
+    @app.get("/admin/stats")
+    async def admin_stats(x_admin_key: Annotated[str | None, Header()] = None):
+        calls.append(f"admin:{x_admin_key}")
+        await asyncio.sleep(0.05)
+        if x_admin_key != "right":
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+        return {"secret": True}
+
+    @app.get("/export")
+    async def export():
+        calls.append("export")
+        await asyncio.sleep(0.05)
+        return StreamingResponse(iter([b"a\n", b"b\n"]))
+
+    app.add_middleware(CoalescingMiddleware)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestCoalescingMiddleware:
+    async def test_concurrent_identical_gets_share_one_execution(
+        self, coalescing_client: AsyncClient, calls: list[str]
+    ):
+        responses = await asyncio.gather(*(coalescing_client.get("/habits", headers=auth("a")) for _ in range(5)))
+
+        assert calls == ["all"]
+        assert all(response.status_code == status.HTTP_200_OK for response in responses)
+        assert {response.json()["calls"] for response in responses} == {1}
+
+    async def test_different_user_or_query_is_not_shared(self, coalescing_client: AsyncClient, calls: list[str]):
+        await asyncio.gather(
+            coalescing_client.get("/habits", headers=auth("a")),
+            coalescing_client.get("/habits", headers=auth("b")),
+            coalescing_client.get("/habits", params={"status_filter": "active"}, headers=auth("a")),
+        )
+
+        assert sorted(calls) == ["active", "all", "all"]
+
+    async def test_different_admin_keys_are_not_shared(self, coalescing_client: AsyncClient, calls: list[str]):
+        wrong, right, missing = await asyncio.gather(
+            coalescing_client.get("/admin/stats", headers={"X-Admin-Key": "wrong"}),
+            coalescing_client.get("/admin/stats", headers={"X-Admin-Key": "right"}),
+            coalescing_client.get("/admin/stats"),
+        )
+
+        assert sorted(calls) == ["admin:None", "admin:right", "admin:wrong"]
+        assert wrong.status_code == status.HTTP_403_FORBIDDEN
+        assert right.json() == {"secret": True}
+        assert missing.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_sequential_gets_are_not_shared(self, coalescing_client: AsyncClient, calls: list[str]):
+        await coalescing_client.get("/habits", headers=auth("a"))
+        await coalescing_client.get("/habits", headers=auth("a"))
+
+        assert calls == ["all", "all"]
+
+    async def test_write_drops_in_flight_reads(self, coalescing_client: AsyncClient, calls: list[str]):
+        first = asyncio.create_task(coalescing_client.get("/habits", headers=auth("a")))
+        await asyncio.sleep(0.01)
+        await coalescing_client.post("/habits", headers=auth("a"))
+        second = await coalescing_client.get("/habits", headers=auth("a"))
+        await first
+
+        assert calls == ["all", "post", "all"]
+        assert second.json()["calls"] == 3
+
+    async def test_streaming_responses_are_not_shared(self, coalescing_client: AsyncClient, calls: list[str]):
+        responses = await asyncio.gather(*(coalescing_client.get("/export", headers=auth("a")) for _ in range(3)))
+
+        assert calls == ["export"] * 3
+        assert all(response.text == "a\nb\n" for response in responses)
@@ -0,0 +1,130 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from backend.core.lifespan import lifespan
+from backend.core.rate_limit import (
+    RateLimit,
+    RateLimiter,
+    RateLimitMiddleware,
+    RouteLimits,
+    check_rate_limit_settings,
+)
+
+
+@pytest.fixture
+def limiter() -> RateLimiter:
+    return RateLimiter(shards=4, sweep_interval=4.0)
+
+
+@pytest.fixture
+async def limited_client(limiter: RateLimiter):
+    app = FastAPI()
+
+    @app.get("/v1/habits")
+    async def habits():
+        return {"ok": True}
+
+    @app.get("/v1/habits/stats")
+    async def stats():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    limits = {"/v1/habits": RouteLimits(per_user=RateLimit(rate=1, burst=2), per_ip=RateLimit(rate=1, burst=4))}
+    app.add_middleware(RateLimitMiddleware, limits=limits, limiter=limiter)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+class TestRateLimiter:
+    def test_burst_then_refill(self, limiter: RateLimiter):
+        limit = RateLimit(rate=2, burst=3)
+
+        assert [limiter.acquire("key", limit, now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire("key", limit, now=0.0) == pytest.approx(0.5)
+        assert limiter.acquire("other", limit, now=0.0) == 0.0
+        assert limiter.acquire("key", limit, now=0.5) == 0.0
+
+    def test_sweep_drops_full_buckets(self, limiter: RateLimiter):
+        limit = RateLimit(rate=1, burst=2)
+        for key in range(100):
+            limiter.acquire(key, limit, now=0.0)
+        assert len(limiter) == 100
+
+        # Each acquire after the sweep step visits the next shard; buckets are full again after 1s
+        for step in range(4):
+            limiter.acquire("probe", limit, now=10.0 + step)
+        assert len(limiter) == 1
+
+
+def bearer(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestRateLimitMiddleware:
+    async def test_returns_429_with_retry_after(self, limited_client: AsyncClient):
+        assert (await limited_client.get("/v1/habits", headers=bearer("a"))).status_code == status.HTTP_200_OK
+        assert (await limited_client.get("/v1/habits/stats", headers=bearer("a"))).status_code == status.HTTP_200_OK
+
+        response = await limited_client.get("/v1/habits", headers=bearer("a"))
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["Retry-After"] == "1"
+
+        # Another user behind the same IP still fits in the IP bucket; routes outside the group are not limited
+        assert (await limited_client.get("/v1/habits", headers=bearer("b"))).status_code == status.HTTP_200_OK
+        for _ in range(5):
+            assert (await limited_client.get("/health")).status_code == status.HTTP_200_OK
+
+    async def test_new_token_per_request_is_limited_per_ip(self, limited_client: AsyncClient):
+        statuses = [(await limited_client.get("/v1/habits", headers=bearer(str(i)))).status_code for i in range(5)]
+        assert statuses == [status.HTTP_200_OK] * 4 + [status.HTTP_429_TOO_MANY_REQUESTS]
+
+    async def test_anonymous_requests_limited_per_ip(self, limited_client: AsyncClient):
+        statuses = [(await limited_client.get("/v1/habits")).status_code for _ in range(5)]
+        assert statuses == [status.HTTP_200_OK] * 4 + [status.HTTP_429_TOO_MANY_REQUESTS]
+
+    async def test_bot_skips_ip_bucket(self, limited_client: AsyncClient):
+        bot = {"X-Bot-Key": "bot-key"}
+        with patch("backend.core.rate_limit.settings.bot_service_key", "bot-key"):
+            for i in range(10):
+                response = await limited_client.get("/v1/habits", headers={**bot, **bearer(str(i))})
+                assert response.status_code == status.HTTP_200_OK
+
+            # Anonymous bot requests are limited per Telegram user
+            logins = [
+                (await limited_client.get("/v1/habits", headers={**bot, "X-Telegram-Id": "1"})).status_code
+                for _ in range(3)
+            ]
+            assert logins == [status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS]
+            other = await limited_client.get("/v1/habits", headers={**bot, "X-Telegram-Id": "2"})
+            assert other.status_code == status.HTTP_200_OK
+
+            # A wrong key is just another client behind the IP
+            statuses = [
+                (await limited_client.get("/v1/habits", headers={"X-Bot-Key": "wrong"})).status_code for _ in range(5)
+            ]
+            assert statuses == [status.HTTP_200_OK] * 4 + [status.HTTP_429_TOO_MANY_REQUESTS]
+
+
+class TestRateLimitSettings:
+    async def test_startup_requires_bot_service_key(self):
+        with (
+            patch("backend.core.rate_limit.settings.rate_limit_enabled", True),
+            patch("backend.core.rate_limit.settings.bot_service_key", None),
+            pytest.raises(RuntimeError, match="BOT_SERVICE_KEY"),
+        ):
+            async with lifespan(FastAPI()):
+                pass
+
+    @pytest.mark.parametrize(("enabled", "bot_key"), [(False, None), (True, "bot-key")])
+    def test_settings_accepted(self, enabled: bool, bot_key: str | None):
+        with (
+            patch("backend.core.rate_limit.settings.rate_limit_enabled", enabled),
+            patch("backend.core.rate_limit.settings.bot_service_key", bot_key),
+        ):
+            check_rate_limit_settings()
@@ -0,0 +1,86 @@
+import json
+from collections.abc import AsyncGenerator
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.session import get_read_snapshot_db
+from backend.models.habit import Habit, HabitCompletion
+from backend.models.user import User
+from backend.services.export_service import ExportFormat, ExportService, ExportTable
+
+
+@pytest.fixture
+async def committed_user(async_engine) -> AsyncGenerator[User]:
+    """A user with habits committed for real, so that other connections can see them."""
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        user = User(telegram_id=555000111, username="exporter", is_active=True)
+        session.add(user)
+        await session.flush()
+        habits = [Habit(user_id=user.id, title=f"Habit {i}", completion_count=i) for i in range(5)]
+        session.add_all(habits)
+        await session.flush()
+        session.add_all(
+            [
+                HabitCompletion(habit_id=habits[1].id, user_id=user.id, completed_on=date(2024, 1, 2)),
+                HabitCompletion(habit_id=habits[2].id, user_id=user.id, completed_on=date(2024, 1, 1)),
+                HabitCompletion(habit_id=habits[2].id, user_id=user.id, completed_on=date(2024, 1, 3)),
+            ]
+        )
+        await session.commit()
+
+    yield user
+
+    async with AsyncSession(async_engine) as session:
+        await session.execute(delete(Habit).where(Habit.user_id == user.id))
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+@pytest.mark.export_service
+class TestExportService:
+    """ExportService against the real read engine (autocommit, read-only connections)."""
+
+    async def test_stream_habits_from_snapshot_session(self, committed_user: User, read_session_factory):
+        sessions = get_read_snapshot_db()
+        session = await anext(sessions)
+        try:
+            with patch("backend.services.export_service.EXPORT_BATCH_SIZE", 2):
+                chunks = [
+                    chunk
+                    async for chunk in ExportService(session).stream_export(
+                        ExportFormat.NDJSON, user_id=committed_user.id
+                    )
+                ]
+        finally:
+            await sessions.aclose()
+
+        rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+        habits = [row for row in rows if row["kind"] == "habit"]
+        completions = [row for row in rows if row["kind"] == "completion"]
+        assert rows == habits + completions
+        assert [row["title"] for row in habits] == [f"Habit {i}" for i in range(5)]
+        assert [row["completed_on"] for row in completions] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        assert [row["habit_id"] for row in completions] == [habits[2]["id"], habits[1]["id"], habits[2]["id"]]
+        assert {row["telegram_id"] for row in completions} == {committed_user.telegram_id}
+        # 5 habits and 3 completions in batches of 2
+        assert len(chunks) == 5
+
+    async def test_csv_holds_a_single_table(self, read_session_factory):
+        async with read_session_factory() as session:
+            chunks = ExportService(session).stream_export(
+                ExportFormat.CSV, tables=(ExportTable.HABITS, ExportTable.COMPLETIONS)
+            )
+            with pytest.raises(ValueError, match="exactly one table"):
+                await anext(chunks)
+
+    async def test_plain_read_session_cannot_stream(self, read_session_factory):
+        """The autocommit read session has no transaction, which server-side cursors require."""
+        async with read_session_factory() as session:
+            with pytest.raises(Exception, match="cursor cannot be created outside of a transaction"):
+                chunks = ExportService(session).stream_export(ExportFormat.CSV)
+                async for _ in chunks:
+                    pass
@@ -1,11 +1,14 @@
+import asyncio
 from collections.abc import AsyncGenerator
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models.habit import Habit
+from backend.models.habit import Habit, HabitCompletion
+from backend.models.user import User
 from backend.schemas.habit import HabitCreate, HabitUpdate
 from backend.services.habit_service import HabitService
 
@@ -232,49 +235,53 @@ class TestHabitService:
         self, habit_service: HabitService, mock_db_session: AsyncMock, db_habit: Habit
     ) -> None:
         """Test marking a habit as completed."""
-        # Мокаем результат запроса
+        # UPDATE ... RETURNING возвращает уже обновлённую привычку
+        initial_count = db_habit.completion_count
+        db_habit.completion_count += 1
+        db_habit.last_completed = datetime.now(UTC)
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = db_habit
         mock_db_session.execute.return_value = mock_result
-
-        # Мокаем flush и refresh
+        mock_db_session.add = MagicMock()
         mock_db_session.flush = AsyncMock()
-        mock_db_session.refresh = AsyncMock()
 
         # Выполняем complete_habit
-        initial_count = db_habit.completion_count
         result = await habit_service.complete_habit(habit_id=db_habit.id)
 
         # Проверяем результат
         assert result is not None
         assert result.id == db_habit.id
         assert result.completion_count == initial_count + 1
-        assert result.last_completed is not None
         assert isinstance(result.last_completed, datetime)
-        assert result.updated_at >= db_habit.updated_at
 
-        # Проверяем вызовы
+        # Проверяем вызовы: одно условное UPDATE и запись в историю
         mock_db_session.execute.assert_called_once()
+        update_stmt = mock_db_session.execute.call_args.args[0]
+        assert update_stmt.is_update
+        assert "last_completed IS NULL OR habits.last_completed <" in str(update_stmt)
+        completion = mock_db_session.add.call_args.args[0]
+        assert isinstance(completion, HabitCompletion)
+        assert (completion.habit_id, completion.completed_on) == (db_habit.id, datetime.now(UTC).date())
         mock_db_session.flush.assert_called_once()
-        mock_db_session.refresh.assert_called_once_with(db_habit, attribute_names=["updated_at"])
 
     async def test_complete_habit_already_completed_today(
         self, habit_service: HabitService, mock_db_session: AsyncMock, db_habit: Habit
     ) -> None:
         """Test attempting to complete a habit already completed today."""
-        db_habit.last_completed = datetime.now(UTC)
+        # UPDATE не нашёл подходящей строки, но привычка существует
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = db_habit
+        mock_result.scalar_one_or_none.return_value = None
         mock_db_session.execute.return_value = mock_result
+        mock_db_session.scalar = AsyncMock(return_value=db_habit.id)
+        mock_db_session.add = MagicMock()
         mock_db_session.flush = AsyncMock()
-        mock_db_session.refresh = AsyncMock()
 
         with pytest.raises(ValueError, match="Habit already completed today"):
             await habit_service.complete_habit(habit_id=db_habit.id)
 
         mock_db_session.execute.assert_called_once()
+        mock_db_session.add.assert_not_called()
         mock_db_session.flush.assert_not_called()
-        mock_db_session.refresh.assert_not_called()
 
     async def test_complete_habit_not_found(self, habit_service: HabitService, mock_db_session: AsyncMock) -> None:
         """Test completing a non-existent habit."""
@@ -282,10 +289,9 @@ class TestHabitService:
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = None
         mock_db_session.execute.return_value = mock_result
-
-        # Мокаем flush и refresh (не должны вызываться)
+        mock_db_session.scalar = AsyncMock(return_value=None)
+        mock_db_session.add = MagicMock()
         mock_db_session.flush = AsyncMock()
-        mock_db_session.refresh = AsyncMock()
 
         # Выполняем complete_habit
         result = await habit_service.complete_habit(habit_id=999)
@@ -295,8 +301,44 @@ class TestHabitService:
 
         # Проверяем вызовы
         mock_db_session.execute.assert_called_once()
+        mock_db_session.add.assert_not_called()
         mock_db_session.flush.assert_not_called()
-        mock_db_session.refresh.assert_not_called()
+
+    async def test_concurrent_completions_count_once(self, async_engine) -> None:
+        """Two sessions completing the same habit at once: exactly one succeeds."""
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            user = User(telegram_id=777000111, username="racer", is_active=True)
+            session.add(user)
+            await session.flush()
+            habit = Habit(user_id=user.id, title="Race", is_active=True, completion_count=0)
+            session.add(habit)
+            await session.commit()
+
+        async def complete() -> bool:
+            async with AsyncSession(async_engine) as session:
+                try:
+                    await HabitService(session).complete_habit(habit.id)
+                except ValueError:
+                    return False
+                await session.commit()
+                return True
+
+        try:
+            results = await asyncio.gather(complete(), complete())
+            async with AsyncSession(async_engine) as session:
+                completion_count = await session.scalar(select(Habit.completion_count).where(Habit.id == habit.id))
+                history = await session.scalar(
+                    select(func.count()).select_from(HabitCompletion).where(HabitCompletion.habit_id == habit.id)
+                )
+        finally:
+            async with AsyncSession(async_engine) as session:
+                await session.execute(delete(Habit).where(Habit.id == habit.id))
+                await session.execute(delete(User).where(User.id == user.id))
+                await session.commit()
+
+        assert sorted(results) == [False, True]
+        assert completion_count == 1
+        assert history == 1
 
     async def test_transfer_habits(self, habit_service: HabitService, mock_db_session: AsyncMock) -> None:
         yesterday = datetime.now(UTC) - timedelta(days=1)
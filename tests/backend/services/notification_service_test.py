@@ -2,10 +2,11 @@ from collections.abc import AsyncGenerator
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models.habit import Habit
+from backend.models.habit import Habit, HabitCompletion
 from backend.models.user import User
 from backend.services.notification_service import NotificationService
 
@@ -56,3 +57,125 @@ class TestNotificationService:
             assert args[0] == 123456789
             assert "Drink water" in args[1]
             assert "Good morning" in args[1]
+
+    async def test_send_daily_reminders_complete_buttons(
+        self, notification_service: NotificationService, mock_db_session: AsyncMock
+    ):
+        user = User(id=1, telegram_id=123456789, username="testuser", is_active=True)
+        pending = Habit(id=1, user_id=1, title="Drink <water>", last_completed=None, is_active=True)
+        done = Habit(id=2, user_id=1, title="Read", last_completed=datetime.now(UTC), is_active=True)
+
+        mock_result = MagicMock()
+        mock_result.__iter__ = MagicMock(return_value=iter([(user, pending), (user, done)]))
+        mock_db_session.execute.return_value = mock_result
+
+        with patch.object(notification_service, "_send_message", new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = True
+            await notification_service.send_daily_reminders()
+            mock_send.assert_called_once()
+            assert "Drink &lt;water&gt;" in mock_send.call_args[0][1]
+            assert mock_send.call_args.kwargs["reply_markup"] == {
+                "inline_keyboard": [[{"text": "Done: Drink <water>", "callback_data": "complete:1"}]]
+            }
+
+    @pytest.mark.parametrize(
+        ("status_code", "description", "unreachable"),
+        [
+            (403, "Forbidden: bot was blocked by the user", True),
+            (400, "Bad Request: chat not found", True),
+            (400, "Bad Request: can't parse entities", False),
+            (500, "Internal Server Error", False),
+        ],
+    )
+    async def test_send_message_classifies_unreachable_chats(
+        self, notification_service: NotificationService, status_code: int, description: str, unreachable: bool
+    ):
+        response = httpx.Response(status_code, json={"ok": False, "description": description})
+
+        with patch("httpx.AsyncClient.post", new_callable=AsyncMock, return_value=response):
+            assert await notification_service._send_message(123456789, "text") is False
+
+        assert notification_service.unreachable_chat_ids == ([123456789] if unreachable else [])
+
+    async def test_send_daily_reminders_disables_unreachable_users(
+        self, notification_service: NotificationService, mock_db_session: AsyncMock
+    ):
+        user = User(id=1, telegram_id=123456789, username="testuser", is_active=True)
+        habit = Habit(id=1, user_id=1, title="Drink water", last_completed=None, is_active=True)
+
+        mock_result = MagicMock()
+        mock_result.__iter__ = MagicMock(return_value=iter([(user, habit)]))
+        mock_db_session.execute.return_value = mock_result
+
+        async def blocked(chat_id: int, *args, **kwargs) -> bool:
+            notification_service.unreachable_chat_ids.append(chat_id)
+            return False
+
+        with patch.object(notification_service, "_send_message", side_effect=blocked):
+            await notification_service.send_daily_reminders()
+
+        assert mock_db_session.execute.await_count == 2
+        update_stmt = mock_db_session.execute.await_args_list[1].args[0]
+        assert update_stmt.is_update
+        assert update_stmt.compile().params["telegram_id_1"] == [123456789]
+        mock_db_session.commit.assert_awaited_once()
+        assert notification_service.unreachable_chat_ids == []
+
+    async def test_send_weekly_digest(self, db_session: AsyncSession):
+        now = datetime.now(UTC)
+        today = now.date()
+        user = User(telegram_id=111, username="digest", is_active=True)
+        lapsed = User(telegram_id=444, username="lapsed", is_active=True)
+        no_habits = User(telegram_id=222, username="nohabits", is_active=True)
+        blocked = User(telegram_id=333, username="blocked", is_active=True, notifications_disabled_at=now)
+        db_session.add_all([user, lapsed, no_habits, blocked])
+        await db_session.flush()
+
+        # last_completed is what the nightly transfer leaves behind: only today's completions keep it
+        read = Habit(user_id=user.id, title="Read <books>", completion_count=12, last_completed=now)
+        run = Habit(user_id=user.id, title="Run", completion_count=5, last_completed=now)
+        swim = Habit(user_id=user.id, title="Swim", completion_count=3)
+        stretch = Habit(user_id=user.id, title="Stretch", completion_count=7)
+        archived = Habit(user_id=user.id, title="Archived", completion_count=99, is_active=False)
+        walk = Habit(user_id=lapsed.id, title="Walk", completion_count=2)
+        blocked_habit = Habit(user_id=blocked.id, title="Walk", completion_count=1, last_completed=now)
+        db_session.add_all([read, run, swim, stretch, archived, walk, blocked_habit])
+        await db_session.flush()
+
+        completions = [
+            (read, 0),
+            (read, 1),
+            (read, 2),
+            (run, 0),
+            (run, 4),
+            (stretch, 6),
+            (swim, 10),
+            (walk, 1),
+            (walk, 2),
+            (blocked_habit, 0),
+        ]
+        db_session.add_all(
+            [
+                HabitCompletion(habit_id=habit.id, user_id=habit.user_id, completed_on=today - timedelta(days=days))
+                for habit, days in completions
+            ]
+        )
+        await db_session.flush()
+
+        service = NotificationService(db_session, "fake_token")
+        with (
+            patch("backend.services.notification_service.WEEKLY_DIGEST_CHUNK_SIZE", 1),
+            patch.object(service, "_send_message", new_callable=AsyncMock, return_value=True) as mock_send,
+        ):
+            await service.send_weekly_digest()
+
+        messages = dict(call.args for call in mock_send.await_args_list)
+        assert set(messages) == {111, 444}
+        assert "Completions this week: <b>6</b>" in messages[111]
+        assert "Active habits: <b>4</b>" in messages[111]
+        assert "Total completions: <b>27</b>" in messages[111]
+        assert "Current streak: <b>3</b> days" in messages[111]
+        assert "Best habit this week: <b>Read &lt;books&gt;</b> (3 completions)" in messages[111]
+        # Streak counts only runs that include today, as in the /habits/stats endpoint
+        assert "Completions this week: <b>2</b>" in messages[444]
+        assert "Current streak: <b>0</b> days" in messages[444]
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models.user import User
@@ -44,23 +45,20 @@ class TestUserService:
     async def test_get_or_create_user_new(
         self, user_service: UserService, mock_db_session: AsyncMock, sample_user_data: dict
     ) -> None:
-        """Test creating a new user."""
+        """Test creating a new user with a single upsert statement."""
         user_data = UserCreate(**sample_user_data)
+        now = datetime.now(UTC)
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None  # Пользователь не существует
+        mock_result.mappings.return_value.first.return_value = {
+            **sample_user_data,
+            "id": 1,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+            "auth_token": "test-auth-token",
+        }
         mock_db_session.execute.return_value = mock_result
         mock_db_session.add = MagicMock()
-        mock_db_session.flush = AsyncMock()
-
-        # Настраиваем refresh, чтобы он обновлял mock_user
-        async def refresh_side_effect(user, attribute_names=None):
-            user.id = 1
-            user.is_active = True
-            user.created_at = datetime.now(UTC)
-            user.updated_at = datetime.now(UTC)
-            user.auth_token = "test-auth-token"
-
-        mock_db_session.refresh.side_effect = refresh_side_effect
 
         result = await user_service.get_or_create_user(user_data)
 
@@ -70,9 +68,35 @@ class TestUserService:
         assert result.auth_token == "test-auth-token"
         assert isinstance(result.created_at, datetime)
         assert isinstance(result.updated_at, datetime)
-        mock_db_session.add.assert_called_once()
-        mock_db_session.flush.assert_called_once()
-        mock_db_session.refresh.assert_called_once()
+        mock_db_session.execute.assert_called_once()
+        mock_db_session.add.assert_not_called()
+        mock_db_session.flush.assert_not_called()
+        mock_db_session.refresh.assert_not_called()
+
+    async def test_bulk_upsert_users_deduplicates(
+        self, user_service: UserService, mock_db_session: AsyncMock, sample_user_data: dict
+    ) -> None:
+        """Test that duplicate telegram_ids are collapsed into one row of a single statement."""
+        mock_result = MagicMock()
+        mock_result.mappings.return_value = []
+        mock_db_session.execute.return_value = mock_result
+
+        users = [UserCreate(**sample_user_data), UserCreate(**{**sample_user_data, "first_name": "John"})]
+        result = await user_service.bulk_upsert_users(users)
+
+        assert result == []
+        mock_db_session.execute.assert_called_once()
+        statement = mock_db_session.execute.call_args[0][0]
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert params["first_name_m0"] == "John"
+        assert "telegram_id_m1" not in params
+
+    async def test_bulk_upsert_users_empty(self, user_service: UserService, mock_db_session: AsyncMock) -> None:
+        """Test that an empty batch does not hit the database."""
+        result = await user_service.bulk_upsert_users([])
+
+        assert result == []
+        mock_db_session.execute.assert_not_called()
 
     async def test_authenticate_telegram_user_success(
         self, user_service: UserService, mock_db_session: AsyncMock, sample_user_data: dict
@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bot.api.cache import HabitCache
+from bot.api.client import APIClient
+from bot.handlers.habits import cb_refresh_habits
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr("bot.api.cache.time", fake)
+    return fake
+
+
+def habit(habit_id: int, **fields) -> dict:
+    return {"id": habit_id, "title": f"Habit {habit_id}", "is_active": True, "completion_count": 0, **fields}
+
+
+class TestHabitCache:
+    def test_entries_expire_after_ttl(self, clock):
+        cache = HabitCache(ttl=30.0)
+        cache.set(1, [habit(1)])
+
+        clock.now += 30
+        assert cache.get(1) == [habit(1)]
+        clock.now += 0.1
+        assert cache.get(1) is None
+
+    def test_mutations_keep_the_original_expiry(self, clock):
+        cache = HabitCache(ttl=30.0)
+        cache.set(1, [habit(1)])
+
+        clock.now += 20
+        cache.add_habit(1, habit(2))
+        clock.now += 11
+        assert cache.get(1) is None
+
+    def test_size_cap_evicts_least_recently_used_user(self, clock):
+        cache = HabitCache(max_users=2)
+        cache.set(1, [habit(1)])
+        cache.set(2, [habit(2)])
+        cache.get(1)
+
+        cache.set(3, [habit(3)])
+
+        assert cache.get(2) is None
+        assert cache.get(1) == [habit(1)]
+        assert cache.get(3) == [habit(3)]
+
+    def test_update_habit_replaces_the_cached_copy(self, clock):
+        cache = HabitCache()
+        cache.set(1, [habit(1), habit(2)])
+
+        cache.update_habit(1, habit(2, title="Renamed"))
+
+        assert cache.get(1) == [habit(1), habit(2, title="Renamed")]
+
+    def test_update_habit_drops_an_inactive_habit(self, clock):
+        cache = HabitCache()
+        cache.set(1, [habit(1), habit(2)])
+
+        cache.update_habit(1, habit(2, is_active=False))
+
+        assert cache.get(1) == [habit(1)]
+
+    def test_update_of_an_unknown_habit_invalidates(self, clock):
+        cache = HabitCache()
+        cache.set(1, [habit(1)])
+
+        cache.update_habit(1, habit(5))
+
+        assert cache.get(1) is None
+
+    def test_mutations_without_an_entry_do_not_create_one(self, clock):
+        cache = HabitCache()
+        cache.add_habit(1, habit(1))
+        cache.update_habit(1, habit(1))
+        cache.remove_habit(1, 1)
+
+        assert cache.get(1) is None
+
+    def test_remove_habit_and_invalidate(self, clock):
+        cache = HabitCache()
+        cache.set(1, [habit(1), habit(2)])
+        cache.set(2, [habit(3)])
+
+        cache.remove_habit(1, 1)
+        assert cache.get(1) == [habit(2)]
+        assert cache.get_habit(1, 2) == habit(2)
+
+        cache.invalidate(1)
+        cache.invalidate(99)
+        assert cache.get(1) is None
+        assert cache.get(2) == [habit(3)]
+
+    def test_get_returns_a_copy(self, clock):
+        cache = HabitCache()
+        cache.set(1, [habit(1)])
+
+        cache.get(1).append(habit(2))
+
+        assert cache.get(1) == [habit(1)]
+
+
+async def test_refresh_button_bypasses_the_cache():
+    cache = HabitCache()
+    cache.set(1, [habit(1, title="Stale")])
+    with patch("bot.api.client.get_http_client", return_value=MagicMock()):
+        api = APIClient(token="token", telegram_id=1)
+    api.request = AsyncMock(return_value=[habit(1, title="Fresh")])
+    cb = MagicMock(data="refresh_habits:0", answer=AsyncMock())
+    cb.message.edit_text = AsyncMock()
+
+    with patch("bot.api.client.habit_cache", cache):
+        await cb_refresh_habits(cb, api=api)
+
+    api.request.assert_awaited_once_with("GET", "/v1/habits/active")
+    assert "Fresh" in cb.message.edit_text.await_args.args[0]
+    assert cache.get(1) == [habit(1, title="Fresh")]
+    cb.answer.assert_awaited_once()
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bot.api.circuit_breaker import CircuitBreaker
+from bot.exceptions import ServiceUnavailableError
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr("bot.api.circuit_breaker.time", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    return breaker
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_consecutive_failures(self, clock):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert not breaker.is_open
+
+        breaker.record_failure()
+        assert breaker.is_open
+        with pytest.raises(ServiceUnavailableError):
+            breaker.before_call()
+
+    def test_lets_a_single_trial_through_after_reset_timeout(self, clock, breaker: CircuitBreaker):
+        clock.now += 29
+        with pytest.raises(ServiceUnavailableError):
+            breaker.before_call()
+
+        clock.now += 2
+        breaker.before_call()
+        # Further calls wait for the trial's outcome
+        with pytest.raises(ServiceUnavailableError):
+            breaker.before_call()
+
+    def test_successful_trial_closes(self, clock, breaker: CircuitBreaker):
+        clock.now += 31
+        breaker.before_call()
+        breaker.record_success()
+
+        assert not breaker.is_open
+        assert breaker.failures == 0
+        breaker.before_call()
+        breaker.before_call()
+
+    def test_failed_trial_reopens_for_another_timeout(self, clock, breaker: CircuitBreaker):
+        clock.now += 31
+        breaker.before_call()
+        breaker.record_failure()
+
+        clock.now += 29
+        with pytest.raises(ServiceUnavailableError):
+            breaker.before_call()
+        clock.now += 2
+        breaker.before_call()
+
+    def test_trial_that_never_reports_back_expires(self, clock, breaker: CircuitBreaker):
+        clock.now += 31
+        breaker.before_call()
+
+        clock.now += 31
+        breaker.before_call()
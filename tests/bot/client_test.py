@@ -0,0 +1,60 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from bot.api.cache import HabitCache
+from bot.api.circuit_breaker import CircuitBreaker
+from bot.api.client import APIClient
+from bot.exceptions import AuthorizationError, RateLimitedError, ServiceUnavailableError
+
+
+@pytest.fixture
+def api():
+    with patch("bot.api.client.get_http_client", return_value=MagicMock()):
+        client = APIClient(token="token", telegram_id=1)
+    client.request = AsyncMock(return_value=[{"id": 2, "title": "New"}])
+    return client
+
+
+async def test_get_active_habits_served_from_cache(api: APIClient):
+    cache = HabitCache()
+    cache.set(1, [{"id": 1, "title": "Cached"}])
+    with patch("bot.api.client.habit_cache", cache):
+        habits = await api.get_active_habits()
+
+    assert habits == [{"id": 1, "title": "Cached"}]
+    api.request.assert_not_awaited()
+
+
+async def test_get_active_habits_fresh_skips_and_refills_cache(api: APIClient):
+    cache = HabitCache()
+    cache.set(1, [{"id": 1, "title": "Cached"}])
+    with patch("bot.api.client.habit_cache", cache):
+        habits = await api.get_active_habits(fresh=True)
+
+    assert habits == [{"id": 2, "title": "New"}]
+    api.request.assert_awaited_once_with("GET", "/v1/habits/active")
+    assert cache.get(1) == [{"id": 2, "title": "New"}]
+
+
+@pytest.mark.parametrize(("headers", "retry_after"), [({"Retry-After": "7"}, 7.0), ({}, 1.0)])
+async def test_too_many_requests_is_retryable(api: APIClient, headers: dict[str, str], retry_after: float):
+    response = httpx.Response(429, headers=headers, json={"detail": "Too many requests"})
+
+    with pytest.raises(RateLimitedError) as exc:
+        await api._handle_response(response)
+    assert exc.value.retry_after == retry_after
+
+
+async def test_refresh_token_with_open_circuit_raises_authorization_error(api: APIClient):
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure()
+    with (
+        patch("bot.api.client.api_circuit", breaker),
+        patch("bot.api.client.get_user_token", AsyncMock(return_value="token")),
+        pytest.raises(AuthorizationError) as exc,
+    ):
+        await api.refresh_token()
+
+    assert isinstance(exc.value.__cause__, ServiceUnavailableError)
@@ -0,0 +1,130 @@
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiogram import Dispatcher
+from aiogram.types import Chat, Message, Update
+
+from bot.dispatcher import OrderedDispatcher, get_chat_key, log_queue_stats
+from bot.fsm_storage import BoundedMemoryStorage
+from bot.middlewares.flood_control import FloodControlMiddleware
+
+
+def make_update(update_id: int, chat_id: int) -> Update:
+    message = Message(
+        message_id=update_id,
+        date=datetime.now(UTC),
+        chat=Chat(id=chat_id, type="private"),
+        text="hi",
+    )
+    return Update(update_id=update_id, message=message)
+
+
+@pytest.fixture
+def processed() -> list[tuple[str, int, int]]:
+    return []
+
+
+@pytest.fixture
+def handle(processed: list[tuple[str, int, int]]):
+    """Stands in for Dispatcher.feed_update: records start/end of each update, yielding in between."""
+
+    async def feed_update(self, bot, update: Update, **kwargs) -> None:
+        chat_id = get_chat_key(update)
+        processed.append(("start", chat_id, update.update_id))
+        await asyncio.sleep(0.01 * (update.update_id % 3))
+        processed.append(("end", chat_id, update.update_id))
+
+    with patch.object(Dispatcher, "feed_update", feed_update):
+        yield
+
+
+@pytest.mark.usefixtures("handle")
+class TestOrderedDispatcher:
+    async def test_updates_of_a_chat_run_one_at_a_time_in_order(self, processed):
+        dp = OrderedDispatcher(max_concurrency=4)
+        updates = [make_update(update_id, chat_id=update_id % 3) for update_id in range(1, 13)]
+        for update in updates:
+            await dp.feed_update(MagicMock(), update)
+        await dp.close_workers()
+
+        for chat_id in range(3):
+            events = [(kind, update_id) for kind, chat, update_id in processed if chat == chat_id]
+            expected_ids = [update.update_id for update in updates if update.message.chat.id == chat_id]
+            # start/end pairs never interleave within a chat, and follow arrival order
+            assert events == [(kind, update_id) for update_id in expected_ids for kind in ("start", "end")]
+
+        # Different chats did run concurrently
+        first_end = next(index for index, event in enumerate(processed) if event[0] == "end")
+        assert len({chat for _, chat, _ in processed[:first_end]}) > 1
+
+    async def test_feed_update_blocks_when_pending_cap_is_reached(self):
+        release = asyncio.Event()
+
+        async def blocking_feed_update(self, bot, update, **kwargs):
+            await release.wait()
+
+        with patch.object(Dispatcher, "feed_update", blocking_feed_update):
+            dp = OrderedDispatcher(max_concurrency=1, max_pending=2)
+            await dp.feed_update(MagicMock(), make_update(1, chat_id=1))
+            await dp.feed_update(MagicMock(), make_update(2, chat_id=2))
+
+            third = asyncio.create_task(dp.feed_update(MagicMock(), make_update(3, chat_id=3)))
+            await asyncio.sleep(0.05)
+            assert not third.done()
+            assert dp.queue_stats()["pending"] + dp.queue_stats()["active"] == 2
+
+            release.set()
+            await asyncio.wait_for(third, timeout=1)
+            await dp.close_workers()
+        assert dp.queue_stats() == {"pending": 0, "active": 0, "chats": 0, "busiest_chat_queue": 0, "workers": 0}
+
+    async def test_unknown_update_type_does_not_leak_slots(self, processed):
+        dp = OrderedDispatcher(max_concurrency=1, max_pending=1)
+        # No event field aiogram knows about, as with update types added to the Bot API later
+        for update_id in range(1, 4):
+            await asyncio.wait_for(dp.feed_update(MagicMock(), Update(update_id=update_id)), timeout=1)
+        await dp.close_workers()
+
+        assert [update_id for kind, _, update_id in processed if kind == "end"] == [1, 2, 3]
+        assert dp.queue_stats()["pending"] == 0
+
+    async def test_shutdown_drains_updates_before_closing_fsm_storage(self, processed):
+        storage = BoundedMemoryStorage()
+        dp = OrderedDispatcher(storage=storage, max_concurrency=2)
+        dp.shutdown.register(lambda: processed.append(("shutdown", 0, 0)))
+
+        for update_id in range(1, 6):
+            await dp.feed_update(MagicMock(), make_update(update_id, chat_id=7))
+
+        original_close = storage.close
+
+        async def close() -> None:
+            processed.append(("fsm-close", 0, 0))
+            await original_close()
+
+        with patch.object(storage, "close", close):
+            await dp.emit_shutdown()
+
+        kinds = [kind for kind, _, _ in processed]
+        assert kinds.count("end") == 5
+        assert kinds.index("fsm-close") > max(index for index, kind in enumerate(kinds) if kind == "end")
+        assert kinds[-1] == "shutdown"
+        assert dp.queue_stats()["workers"] == 0
+
+
+async def test_queue_stats_are_logged_periodically():
+    dp = OrderedDispatcher()
+    dp["flood_control"] = FloodControlMiddleware()
+
+    with patch("bot.dispatcher.log") as log:
+        task = asyncio.create_task(log_queue_stats(dp, interval=0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert log.info.call_count >= 2
+    message = log.info.call_args.args[0]
+    assert "'incoming_queue': {'pending': 0" in message
+    assert "'outgoing_queue': {'queued': 0" in message
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from bot.middlewares.flood_control import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Fake monotonic clock for the bucket only, so the event loop keeps real time."""
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr("bot.middlewares.flood_control.time", fake)
+    return fake
+
+
+class TestTryAcquire:
+    def test_allows_a_burst_then_refuses(self, clock):
+        bucket = TokenBucket(rate=1.0, capacity=3)
+
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    def test_refills_at_rate_up_to_capacity(self, clock):
+        bucket = TokenBucket(rate=2.0, capacity=3)
+        for _ in range(3):
+            bucket.try_acquire()
+
+        clock.now += 0.5
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+        clock.now += 60
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    def test_pause_blocks_until_it_passes(self, clock):
+        bucket = TokenBucket(rate=1.0, capacity=3)
+        bucket.pause(5)
+
+        clock.now += 4.9
+        assert not bucket.try_acquire()
+        clock.now += 0.2
+        assert bucket.try_acquire()
+
+    def test_is_idle_only_when_full_and_not_paused(self, clock):
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        assert bucket.is_idle
+
+        bucket.try_acquire()
+        assert not bucket.is_idle
+        clock.now += 1
+        assert bucket.is_idle
+
+        bucket.pause(3)
+        clock.now += 2
+        assert not bucket.is_idle
+
+
+class TestAcquire:
+    async def test_waits_for_the_next_token(self):
+        bucket = TokenBucket(rate=20.0, capacity=1)
+        await bucket.acquire()
+
+        started = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - started >= 0.04
+
+    async def test_waiters_are_served_in_order(self):
+        bucket = TokenBucket(rate=100.0, capacity=1)
+        served = []
+
+        async def take(index: int) -> None:
+            await bucket.acquire()
+            served.append(index)
+
+        tasks = []
+        for index in range(5):
+            tasks.append(asyncio.create_task(take(index)))
+            await asyncio.sleep(0)
+        assert bucket.waiting > 0
+        await asyncio.gather(*tasks)
+
+        assert served == list(range(5))
+        assert bucket.waiting == 0
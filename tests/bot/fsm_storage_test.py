@@ -0,0 +1,66 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiogram import Dispatcher
+from aiogram.fsm.storage.base import StorageKey
+
+from bot.fsm_storage import BoundedMemoryStorage
+
+
+def make_key(chat_id: int) -> StorageKey:
+    return StorageKey(bot_id=1, chat_id=chat_id, user_id=chat_id)
+
+
+class TestBoundedMemoryStorage:
+    def test_dispatcher_uses_empty_storage(self):
+        storage = BoundedMemoryStorage()
+        assert Dispatcher(storage=storage).fsm.storage is storage
+
+    async def test_evicts_least_recently_used_over_max_size(self):
+        storage = BoundedMemoryStorage(max_size=2)
+        await storage.set_state(make_key(1), "first")
+        await storage.set_state(make_key(2), "second")
+        await storage.get_state(make_key(1))
+        await storage.set_state(make_key(3), "third")
+
+        assert len(storage) == 2
+        assert await storage.get_state(make_key(1)) == "first"
+        assert await storage.get_state(make_key(2)) is None
+
+    async def test_forgets_idle_records_after_ttl(self):
+        storage = BoundedMemoryStorage(ttl=60)
+        with patch("bot.fsm_storage.time.monotonic", return_value=1000.0):
+            await storage.set_data(make_key(1), {"title": "Read"})
+        with patch("bot.fsm_storage.time.monotonic", return_value=1061.0):
+            assert await storage.get_data(make_key(1)) == {}
+
+    @pytest.mark.parametrize("data", [{"title": "Read"}, {}])
+    async def test_close_flushes_pending_changes(self, data: dict):
+        storage = BoundedMemoryStorage(persist=True, flush_interval=3600)
+        with (
+            patch("bot.fsm_storage.storage.load_fsm_record", AsyncMock(return_value=None)),
+            patch("bot.fsm_storage.storage.save_fsm_records", AsyncMock()) as save,
+            patch("bot.fsm_storage.storage.delete_expired_fsm_records", AsyncMock()),
+        ):
+            await storage.set_data(make_key(1), data)
+            await storage.close()
+
+        records, deleted_keys = save.await_args.args
+        if data:
+            assert [(state, saved) for _, state, saved in records] == [(None, data)]
+            assert deleted_keys == []
+        else:
+            assert records == []
+            assert len(deleted_keys) == 1
+
+    async def test_no_flush_task_after_close(self):
+        storage = BoundedMemoryStorage(persist=True)
+        with (
+            patch("bot.fsm_storage.storage.load_fsm_record", AsyncMock(return_value=None)),
+            patch("bot.fsm_storage.storage.save_fsm_records", AsyncMock()),
+            patch("bot.fsm_storage.storage.delete_expired_fsm_records", AsyncMock()),
+        ):
+            await storage.close()
+            await storage.set_state(make_key(1), "late")
+
+        assert storage._flush_task is None
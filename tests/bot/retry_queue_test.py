@@ -0,0 +1,131 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from bot.api.retry_queue import CompletionRetryQueue
+from bot.exceptions import HabitAlreadyCompletedError, RateLimitedError, ServerError, ServiceUnavailableError
+from bot.storage.base import PendingCompletion
+
+
+def make_completion(attempts: int = 0, day: str | None = None) -> PendingCompletion:
+    day = day or datetime.now(UTC).date().isoformat()
+    return PendingCompletion(
+        idempotency_key=f"complete:1:7:{day}",
+        telegram_id=1,
+        habit_id=7,
+        day=day,
+        attempts=attempts,
+    )
+
+
+@pytest.fixture
+def storage():
+    with patch("bot.api.retry_queue.storage") as mock:
+        mock.get_user_token = AsyncMock(return_value="token")
+        mock.delete_pending_completion = AsyncMock()
+        mock.reschedule_completion = AsyncMock()
+        mock.claim_due_completions = AsyncMock(return_value=[])
+        yield mock
+
+
+@pytest.fixture
+def api():
+    api = MagicMock()
+    api.complete_habit = AsyncMock(return_value={"id": 7})
+    with patch("bot.api.retry_queue.APIClient", return_value=api):
+        yield api
+
+
+@pytest.fixture
+def queue() -> CompletionRetryQueue:
+    return CompletionRetryQueue(base_delay=2.0, max_delay=60.0, max_attempts=3)
+
+
+class TestBackoff:
+    @pytest.mark.parametrize(("attempts", "ceiling"), [(0, 2.0), (1, 4.0), (3, 16.0), (10, 60.0)])
+    def test_full_jitter_within_capped_exponential(self, queue: CompletionRetryQueue, attempts: int, ceiling: float):
+        delays = [queue._backoff(attempts) for _ in range(200)]
+
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Spread over the whole range rather than clustered at the ceiling
+        assert min(delays) < ceiling / 4
+        assert max(delays) > ceiling * 3 / 4
+
+
+class TestReplay:
+    async def test_success_deletes_the_entry(self, queue, storage, api):
+        completion = make_completion()
+        await queue._replay(completion)
+
+        api.complete_habit.assert_awaited_once_with(7)
+        storage.delete_pending_completion.assert_awaited_once_with(completion.idempotency_key)
+
+    async def test_already_completed_counts_as_done(self, queue, storage, api):
+        api.complete_habit.side_effect = HabitAlreadyCompletedError()
+        await queue._replay(make_completion())
+
+        storage.delete_pending_completion.assert_awaited_once()
+        storage.reschedule_completion.assert_not_awaited()
+
+    @pytest.mark.parametrize("error", [ServerError(), RateLimitedError(retry_after=0.0), httpx.ConnectError("down")])
+    async def test_transient_error_reschedules_with_backoff(self, queue, storage, api, error: Exception):
+        api.complete_habit.side_effect = error
+        completion = make_completion(attempts=1)
+        with patch("bot.api.retry_queue.time.time", return_value=1000.0):
+            await queue._replay(completion)
+
+        storage.delete_pending_completion.assert_not_awaited()
+        key, attempts, next_attempt_at = storage.reschedule_completion.await_args.args
+        assert (key, attempts) == (completion.idempotency_key, 2)
+        assert 1000.0 <= next_attempt_at <= 1000.0 + 8.0
+
+    async def test_rate_limited_waits_for_retry_after(self, queue, storage, api):
+        api.complete_habit.side_effect = RateLimitedError(retry_after=30.0)
+        with patch("bot.api.retry_queue.time.time", return_value=1000.0):
+            await queue._replay(make_completion(attempts=1))
+
+        _, attempts, next_attempt_at = storage.reschedule_completion.await_args.args
+        assert attempts == 2
+        assert next_attempt_at >= 1000.0 + 30.0
+
+    async def test_enqueue_after_rate_limit_waits_for_retry_after(self, queue, storage):
+        storage.add_pending_completion = AsyncMock()
+        with patch("bot.api.retry_queue.time.time", return_value=1000.0):
+            await queue.enqueue(1, 7, RateLimitedError(retry_after=30.0))
+
+        assert storage.add_pending_completion.await_args.kwargs["next_attempt_at"] >= 1000.0 + 30.0
+
+    async def test_drops_after_max_attempts(self, queue, storage, api):
+        api.complete_habit.side_effect = ServerError()
+        completion = make_completion(attempts=2)
+        await queue._replay(completion)
+
+        storage.reschedule_completion.assert_not_awaited()
+        storage.delete_pending_completion.assert_awaited_once_with(completion.idempotency_key)
+
+    async def test_open_circuit_leaves_the_entry_claimed(self, queue, storage, api):
+        api.complete_habit.side_effect = ServiceUnavailableError()
+        await queue._replay(make_completion())
+
+        storage.reschedule_completion.assert_not_awaited()
+        storage.delete_pending_completion.assert_not_awaited()
+
+    async def test_drops_completion_from_a_past_day(self, queue, storage, api):
+        yesterday = (datetime.now(UTC) - timedelta(days=1)).date().isoformat()
+        completion = make_completion(day=yesterday)
+        await queue._replay(completion)
+
+        api.complete_habit.assert_not_awaited()
+        storage.delete_pending_completion.assert_awaited_once_with(completion.idempotency_key)
+
+    async def test_replay_due_claims_with_a_lease(self, queue, storage, api):
+        storage.claim_due_completions.return_value = [make_completion()]
+        with patch("bot.api.retry_queue.time.time", return_value=1000.0):
+            await queue.replay_due()
+
+        storage.claim_due_completions.assert_awaited_once_with(
+            1000.0, queue.batch_size, lease_until=1000.0 + queue.lease
+        )
+        api.complete_habit.assert_awaited_once_with(7)
@@ -0,0 +1,71 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from backend.core.config import settings
+from bot.storage.base import PendingCompletion, Store
+from bot.storage.postgres import PostgresStore
+from bot.storage.sqlite import SQLiteStore
+
+TEST_DSN = (
+    f"postgresql://{settings.db_username}:{settings.db_password}@{settings.db_host}:{settings.db_port}/"
+    f"{settings.db_name}_test"
+)
+
+
+def make_completion(habit_id: int) -> PendingCompletion:
+    return PendingCompletion(
+        idempotency_key=f"complete:1:{habit_id}:2026-01-01", telegram_id=1, habit_id=habit_id, day="2026-01-01"
+    )
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+async def store(request, tmp_path: Path):
+    store: Store = SQLiteStore(tmp_path / "bot.db") if request.param == "sqlite" else PostgresStore(TEST_DSN)
+    await store.connect()
+    yield store
+    for habit_id in range(10):
+        await store.delete_pending_completion(make_completion(habit_id).idempotency_key)
+    await store.close()
+
+
+class TestPendingCompletions:
+    async def test_claimed_completions_are_not_due_until_lease_expires(self, store: Store):
+        for habit_id in range(3):
+            await store.add_pending_completion(make_completion(habit_id), next_attempt_at=100.0 + habit_id)
+
+        claimed = await store.claim_due_completions(now=200.0, limit=2, lease_until=260.0)
+        assert [completion.habit_id for completion in claimed] == [0, 1]
+
+        # Only the unclaimed one is left for another replica
+        other = await store.claim_due_completions(now=201.0, limit=10, lease_until=261.0)
+        assert [completion.habit_id for completion in other] == [2]
+        assert await store.claim_due_completions(now=259.0, limit=10, lease_until=320.0) == []
+
+        # The claim expires, e.g. after the replica died mid-replay
+        expired = await store.claim_due_completions(now=260.0, limit=10, lease_until=320.0)
+        assert [completion.habit_id for completion in expired] == [0, 1]
+
+    async def test_concurrent_claims_are_disjoint(self, store: Store):
+        for habit_id in range(10):
+            await store.add_pending_completion(make_completion(habit_id), next_attempt_at=100.0)
+
+        if isinstance(store, PostgresStore):
+            replica = PostgresStore(TEST_DSN)
+            await replica.connect()
+        else:
+            replica = store
+        try:
+            claims = await asyncio.gather(
+                *(
+                    claimer.claim_due_completions(now=200.0, limit=3, lease_until=260.0)
+                    for claimer in (store, replica, store, replica)
+                )
+            )
+        finally:
+            if replica is not store:
+                await replica.close()
+
+        claimed_ids = [completion.habit_id for claim in claims for completion in claim]
+        assert len(claimed_ids) == len(set(claimed_ids)) == 10
@@ -0,0 +1,47 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiogram.types import CallbackQuery, Update, User
+
+from bot.middlewares.throttling import ThrottlingMiddleware
+
+
+def make_callback_update(update_id: int, data: str) -> Update:
+    callback = CallbackQuery(
+        id=str(update_id),
+        from_user=User(id=1, is_bot=False, first_name="Jane"),
+        chat_instance="chat",
+        data=data,
+    )
+    return Update(update_id=update_id, callback_query=callback)
+
+
+@pytest.fixture
+def answer():
+    with patch.object(CallbackQuery, "answer", AsyncMock()) as mock:
+        yield mock
+
+
+async def tap_twice(middleware: ThrottlingMiddleware, data: str) -> list[int]:
+    handled = []
+
+    async def handler(event: Update, _data: dict) -> None:
+        handled.append(event.update_id)
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(middleware(handler, make_callback_update(update_id, data), {}) for update_id in (1, 2)))
+    await middleware(handler, make_callback_update(3, data), {})
+    return handled
+
+
+@pytest.mark.usefixtures("answer")
+@pytest.mark.parametrize("data", ["complete:5:0", "complete:5", "delete:5:1"])
+async def test_mutating_callbacks_are_debounced(data: str):
+    assert await tap_twice(ThrottlingMiddleware(), data) == [1]
+
+
+@pytest.mark.usefixtures("answer")
+@pytest.mark.parametrize("data", ["habits_page:2", "refresh_habits:1", "refresh_habits", "edit:5:0"])
+async def test_navigation_callbacks_always_run(data: str):
+    assert await tap_twice(ThrottlingMiddleware(), data) == [1, 2, 3]
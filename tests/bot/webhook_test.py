@@ -0,0 +1,28 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from bot.webhook import ShardedRequestHandler, create_webhook_app, run_webhook
+
+
+@pytest.mark.parametrize(
+    ("base_url", "secret", "missing"),
+    [(None, "secret", "WEBHOOK_BASE_URL"), ("https://bot.example.com", None, "WEBHOOK_SECRET")],
+)
+async def test_run_webhook_requires_settings(base_url: str | None, secret: str | None, missing: str):
+    with (
+        patch("bot.webhook.settings.webhook_base_url", base_url),
+        patch("bot.webhook.settings.webhook_secret", secret),
+        pytest.raises(RuntimeError, match=missing),
+    ):
+        await run_webhook(MagicMock(), MagicMock())
+
+
+def test_webhook_updates_are_fed_in_the_request():
+    with patch("bot.webhook.settings.webhook_path", "/webhook"):
+        app = create_webhook_app(MagicMock(), MagicMock())
+
+    (route,) = [route for route in app.router.routes() if route.method == "POST"]
+    handler = route.handler.__self__
+    assert isinstance(handler, ShardedRequestHandler)
+    assert handler.handle_in_background is False
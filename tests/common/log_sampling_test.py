@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+
+from common.log_sampling import SamplingFilter
+
+
+def make_record(level: str, sampled: bool = True) -> dict:
+    return {"level": SimpleNamespace(name=level), "extra": {"sampled": True} if sampled else {}}
+
+
+def test_keeps_every_nth_sampled_record_per_level():
+    sampling = SamplingFilter({"info": 3})
+
+    kept = [sampling(make_record("INFO")) for _ in range(7)]
+
+    assert kept == [True, False, False, True, False, False, True]
+
+
+def test_unsampled_records_and_unconfigured_levels_always_pass():
+    sampling = SamplingFilter({"INFO": 3})
+
+    assert all(sampling(make_record("INFO", sampled=False)) for _ in range(5))
+    assert all(sampling(make_record("DEBUG")) for _ in range(5))